@@ -4,6 +4,7 @@
 Usage:
   python benchmark_compare.py --file test_output.json --iterations 2000
   python benchmark_compare.py --size 10000 --iterations 200
+  python benchmark_compare.py --latency --samples 5000 --batch 10
 """
 
 from __future__ import annotations
@@ -11,9 +12,13 @@ from __future__ import annotations
 import argparse
 import json
 import time
-from typing import Callable
+import timeit
+from typing import Callable, Sequence
 
+from json_engine.api import dumps as engine_dumps
 from json_engine.api import loads as engine_loads
+from json_engine.encoder import JSONEncoder
+from json_engine.parser import JSONDecoder
 
 try:
     import orjson  # type: ignore
@@ -50,13 +55,85 @@ def _bench(label: str, func: Callable[[str], object], data: str, iterations: int
     return elapsed
 
 
+def _generate_message(target_size: int) -> str:
+    message = {
+        "id": 48213,
+        "type": "event",
+        "user": "alice",
+        "ok": True,
+        "score": 0.75,
+        "tags": [],
+    }
+    while len(json.dumps(message)) < target_size:
+        message["tags"].append(f"tag{len(message['tags'])}")
+    return json.dumps(message)
+
+
+def _percentile(ordered: Sequence[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _latency(
+    label: str, func: Callable[[object], object], arg: object, samples: int, batch: int
+) -> list[float]:
+    # Each sample times a batch of calls, as timeit does, so the timer's own
+    # resolution and overhead are spread over `batch` calls.
+    timer = timeit.Timer(lambda: func(arg))
+    timer.timeit(batch)  # warm-up
+    per_call = sorted(timer.timeit(batch) / batch for _ in range(samples))
+    p50, p99, p999 = (_percentile(per_call, q) * 1e6 for q in (0.5, 0.99, 0.999))
+    print(f"{label:<28} p50 {p50:8.2f}us | p99 {p99:8.2f}us | p999 {p999:8.2f}us")
+    return per_call
+
+
+def _noop(arg: object) -> object:
+    return arg
+
+
+def _run_latency(samples: int, batch: int) -> None:
+    print(f"Latency | samples: {samples} | calls per sample: {batch}")
+    print("--- call-setup overhead")
+    _latency("harness (no-op call)", _noop, None, samples, batch)
+    _latency("JSONDecoder()", lambda _: JSONDecoder(), None, samples, batch)
+    _latency("JSONEncoder()", lambda _: JSONEncoder(), None, samples, batch)
+    _latency("json_engine loads('{}')", engine_loads, "{}", samples, batch)
+    _latency("json_engine dumps({})", engine_dumps, {}, samples, batch)
+
+    for target_size in (100, 250, 500):
+        data = _generate_message(target_size)
+        obj = json.loads(data)
+        print(f"--- {len(data)} byte message")
+        _latency("json_engine loads", engine_loads, data, samples, batch)
+        _latency("json (stdlib) loads", json.loads, data, samples, batch)
+        if HAVE_ORJSON:
+            _latency("orjson loads", orjson.loads, data, samples, batch)
+        _latency("json_engine dumps", engine_dumps, obj, samples, batch)
+        _latency("json (stdlib) dumps", json.dumps, obj, samples, batch)
+        if HAVE_ORJSON:
+            _latency("orjson dumps", orjson.dumps, obj, samples, batch)
+
+    if not HAVE_ORJSON:
+        print("orjson not installed - skipped")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Compare JSON parse time.")
     parser.add_argument("--file", type=str, default=None, help="JSON file to parse")
     parser.add_argument("--size", type=int, default=1000, help="Generated data size")
     parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument(
+        "--latency",
+        action="store_true",
+        help="Per-call latency percentiles for small (100-500 byte) messages",
+    )
+    parser.add_argument("--samples", type=int, default=2000, help="Latency samples per row")
+    parser.add_argument("--batch", type=int, default=10, help="Calls timed per latency sample")
     args = parser.parse_args()
 
+    if args.latency:
+        _run_latency(args.samples, args.batch)
+        return
+
     if args.file:
         with open(args.file, encoding="utf-8") as f:
             data = f.read()
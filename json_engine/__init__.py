@@ -3,4 +3,23 @@ Minimal package init for the our student JSON engine.
 Exposes public API from api.py
 """
 
-from .api import loads, dumps, load, dump  # re-export
+from .aio import adump, aiter_items, aload
+from .api import dump, dumpb, dumps, load, loads  # re-export
+from .encoder import RawJSON
+from .ndjson import dump_ndjson, iter_ndjson
+from .stream import iter_values
+
+__all__ = [
+    "loads",
+    "dumps",
+    "dumpb",
+    "load",
+    "dump",
+    "iter_ndjson",
+    "dump_ndjson",
+    "iter_values",
+    "aload",
+    "aiter_items",
+    "adump",
+    "RawJSON",
+]
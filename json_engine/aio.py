@@ -0,0 +1,68 @@
+import asyncio
+import codecs
+from typing import Any, AsyncIterator, List, Union
+
+from .encoder import JSONEncoder
+from .incremental import Event, IncrementalParser, ItemBuilder
+from .ndjson import BLOCK_SIZE
+
+
+async def _aiter_events(reader: Any, chunk_size: int) -> AsyncIterator[List[Event]]:
+    parser = IncrementalParser()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    while True:
+        data = await reader.read(chunk_size)
+        if not data:
+            break
+        if isinstance(data, bytes):
+            data = utf8.decode(data)
+        events = parser.feed(data)
+        if events:
+            yield events
+    yield parser.feed(utf8.decode(b"", final=True)) + parser.close()
+
+
+async def aiter_items(
+    reader: Any, prefix: str, *, chunk_size: int = BLOCK_SIZE
+) -> AsyncIterator[Any]:
+    builder = ItemBuilder(prefix)
+    async for events in _aiter_events(reader, chunk_size):
+        for item in builder.push(events):
+            yield item
+
+
+async def aload(reader: Any, *, chunk_size: int = BLOCK_SIZE) -> Any:
+    builder = ItemBuilder("")
+    items: List[Any] = []
+    async for events in _aiter_events(reader, chunk_size):
+        items.extend(builder.push(events))
+    return items[0]
+
+
+async def adump(
+    obj: Any,
+    writer: Any,
+    *,
+    chunk_size: int = BLOCK_SIZE,
+    yield_every: int = 0,
+    allow_nan: Union[bool, str] = "raise",
+) -> None:
+    buffer: List[str] = []
+    size = 0
+    count = 0
+    for piece in JSONEncoder(allow_nan=allow_nan).iterencode(obj):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            writer.write("".join(buffer).encode("utf-8"))
+            buffer.clear()
+            size = 0
+            await writer.drain()
+        if yield_every:
+            count += 1
+            if count >= yield_every:
+                count = 0
+                await asyncio.sleep(0)
+    if buffer:
+        writer.write("".join(buffer).encode("utf-8"))
+        await writer.drain()
@@ -1,23 +1,199 @@
-from typing import Any, TextIO
+import io
+from typing import IO, Any, List, Optional, TextIO, Tuple, Union
+
+from .encoder import EncodeCache, JSONEncoder
+from .lazy import lazy_loads
+from .ndjson import BLOCK_SIZE
 from .parser import JSONDecoder
-from .encoder import JSONEncoder
 from .tokenizer import TokenizeError as JSONError
 
-__all__ = ["loads", "dumps", "load", "dump", "JSONError"]
+__all__ = ["loads", "dumps", "dumpb", "load", "dump", "JSONError"]
+
+# Decoders and encoders keep no per-call state, so calls with default
+# options share one instance and skip its setup.
+_default_decoder = JSONDecoder()
+_default_encoder = JSONEncoder()
 
 
-def loads(s: str, trace: bool = False) -> Any:
-    decoder = JSONDecoder(trace=trace)
+def loads(
+    s: str,
+    trace: bool = False,
+    include: Any = None,
+    lazy: bool = False,
+    raw: Any = None,
+    allow_nan: bool = False,
+    numeric_arrays: Optional[str] = None,
+    validate: Any = None,
+    max_bytes: Optional[int] = None,
+    max_depth: Optional[int] = None,
+    max_string_length: Optional[int] = None,
+    max_container_items: Optional[int] = None,
+    max_total_values: Optional[int] = None,
+    duplicate_keys: str = "last",
+    check_raw: bool = False,
+) -> Any:
+    options = (
+        include,
+        raw,
+        validate,
+        max_bytes,
+        max_depth,
+        max_string_length,
+        max_container_items,
+        max_total_values,
+    )
+    customized = options.count(None) < len(options) or duplicate_keys != "last"
+    if lazy:
+        if customized or allow_nan or numeric_arrays is not None or check_raw:
+            raise ValueError("decoder options and limits cannot be combined with lazy")
+        return lazy_loads(s)
+    if not customized and not trace and not allow_nan and numeric_arrays is None:
+        return _default_decoder.decode(s)
+    decoder = JSONDecoder(
+        trace=trace,
+        include=include,
+        raw=raw,
+        allow_nan=allow_nan,
+        numeric_arrays=numeric_arrays,
+        validate=validate,
+        max_bytes=max_bytes,
+        max_depth=max_depth,
+        max_string_length=max_string_length,
+        max_container_items=max_container_items,
+        max_total_values=max_total_values,
+        duplicate_keys=duplicate_keys,
+        check_raw=check_raw,
+    )
     return decoder.decode(s)
 
 
-def dumps(obj: Any) -> str:
-    return JSONEncoder().encode(obj)
+def _encoder(
+    cache: Optional[EncodeCache],
+    indent: Union[int, str, None],
+    separators: Optional[Tuple[str, str]],
+    sort_keys: bool,
+    ensure_ascii: bool,
+    allow_nan: Union[bool, str],
+) -> JSONEncoder:
+    if (
+        cache is None
+        and indent is None
+        and separators is None
+        and not sort_keys
+        and not ensure_ascii
+        and allow_nan == "raise"
+    ):
+        return _default_encoder
+    return JSONEncoder(
+        cache=cache,
+        indent=indent,
+        separators=separators,
+        sort_keys=sort_keys,
+        ensure_ascii=ensure_ascii,
+        allow_nan=allow_nan,
+    )
+
+
+def dumps(
+    obj: Any,
+    cache: Optional[EncodeCache] = None,
+    indent: Union[int, str, None] = None,
+    separators: Optional[Tuple[str, str]] = None,
+    sort_keys: bool = False,
+    ensure_ascii: bool = False,
+    allow_nan: Union[bool, str] = "raise",
+) -> str:
+    encoder = _encoder(cache, indent, separators, sort_keys, ensure_ascii, allow_nan)
+    return encoder.encode(obj)
+
+
+def dumpb(
+    obj: Any,
+    cache: Optional[EncodeCache] = None,
+    indent: Union[int, str, None] = None,
+    separators: Optional[Tuple[str, str]] = None,
+    sort_keys: bool = False,
+    ensure_ascii: bool = False,
+    allow_nan: Union[bool, str] = "raise",
+) -> bytes:
+    encoder = _encoder(cache, indent, separators, sort_keys, ensure_ascii, allow_nan)
+    return encoder.encode_bytes(obj)
+
+
+def load(
+    fp: TextIO,
+    trace: bool = False,
+    include: Any = None,
+    lazy: bool = False,
+    raw: Any = None,
+    allow_nan: bool = False,
+    numeric_arrays: Optional[str] = None,
+    validate: Any = None,
+    max_bytes: Optional[int] = None,
+    max_depth: Optional[int] = None,
+    max_string_length: Optional[int] = None,
+    max_container_items: Optional[int] = None,
+    max_total_values: Optional[int] = None,
+    duplicate_keys: str = "last",
+    check_raw: bool = False,
+) -> Any:
+    # Never read more than the limit (plus one, to detect the overflow).
+    data = fp.read() if max_bytes is None else fp.read(max_bytes + 1)
+    return loads(
+        data,
+        trace=trace,
+        include=include,
+        lazy=lazy,
+        raw=raw,
+        allow_nan=allow_nan,
+        numeric_arrays=numeric_arrays,
+        validate=validate,
+        max_bytes=max_bytes,
+        max_depth=max_depth,
+        max_string_length=max_string_length,
+        max_container_items=max_container_items,
+        max_total_values=max_total_values,
+        duplicate_keys=duplicate_keys,
+        check_raw=check_raw,
+    )
+
+
+def _is_binary(fp: IO[Any]) -> bool:
+    if isinstance(fp, (io.RawIOBase, io.BufferedIOBase)):
+        return True
+    if isinstance(fp, io.TextIOBase):
+        return False
+    return "b" in getattr(fp, "mode", "")
 
 
-def load(fp: TextIO, trace: bool = False) -> Any:
-    return loads(fp.read(), trace=trace)
+def _dump_binary(
+    encoder: JSONEncoder, obj: Any, fp: IO[bytes], block_size: int = BLOCK_SIZE
+) -> None:
+    buffer: List[str] = []
+    size = 0
+    for piece in encoder.iterencode(obj):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= block_size:
+            fp.write("".join(buffer).encode("utf-8"))
+            buffer.clear()
+            size = 0
+    if buffer:
+        fp.write("".join(buffer).encode("utf-8"))
 
 
-def dump(obj: Any, fp: TextIO) -> None:
-    fp.write(dumps(obj))
+def dump(
+    obj: Any,
+    fp: IO[Any],
+    cache: Optional[EncodeCache] = None,
+    indent: Union[int, str, None] = None,
+    separators: Optional[Tuple[str, str]] = None,
+    sort_keys: bool = False,
+    ensure_ascii: bool = False,
+    allow_nan: Union[bool, str] = "raise",
+) -> None:
+    encoder = _encoder(cache, indent, separators, sort_keys, ensure_ascii, allow_nan)
+    if _is_binary(fp):
+        _dump_binary(encoder, obj, fp)
+    else:
+        fp.write(encoder.encode(obj))
@@ -0,0 +1,136 @@
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+from .parser import JSONDecoder
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is read-only")
+
+
+class FrozenDict(dict):
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    # The default protocol restores items through __setitem__; build the
+    # copy through dict.__init__ instead.
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+    def __copy__(self):
+        return type(self)(self)
+
+    def __deepcopy__(self, memo):
+        return type(self)({k: copy.deepcopy(v, memo) for k, v in self.items()})
+
+
+class FrozenList(list):
+    __setitem__ = __delitem__ = _readonly
+    append = extend = insert = pop = remove = reverse = sort = clear = _readonly
+    __iadd__ = __imul__ = _readonly
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+    def __copy__(self):
+        return type(self)(self)
+
+    def __deepcopy__(self, memo):
+        return type(self)([copy.deepcopy(v, memo) for v in self])
+
+
+def freeze(value: Any) -> Any:
+    if type(value) is dict:
+        return FrozenDict({k: freeze(v) for k, v in value.items()})
+    if type(value) is list:
+        return FrozenList([freeze(v) for v in value])
+    return value
+
+
+def fast_copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: fast_copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [fast_copy(v) for v in value]
+    return value
+
+
+class CachedDecoder:
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_cache_bytes: int = 64 * 1024 * 1024,
+        mode: str = "frozen",
+        **decoder_options: Any,
+    ):
+        if mode not in ("frozen", "copy"):
+            raise ValueError("mode must be 'frozen' or 'copy'")
+        self.max_entries = max_entries
+        self.max_cache_bytes = max_cache_bytes
+        self.mode = mode
+        self.decoder_options = decoder_options
+        self._decoder = JSONDecoder(**decoder_options)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.current_bytes = 0
+        # (hash, length) -> (source, value, size); the source guards against
+        # hash collisions.
+        self._entries: OrderedDict[Tuple[int, int], Tuple[str, Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def decode(self, s: str) -> Any:
+        if s is None or s == "":
+            raise ValueError("Empty string")
+        key = (hash(s), len(s))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not s and entry[0] != s:
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if entry is not None:
+            return entry[1] if self.mode == "frozen" else fast_copy(entry[1])
+
+        value = self._decoder.decode(s)
+        stored = freeze(value) if self.mode == "frozen" else value
+        size = len(s)
+        if size <= self.max_cache_bytes:
+            with self._lock:
+                if key not in self._entries:
+                    self._entries[key] = (s, stored, size)
+                    self.current_bytes += size
+                    self._evict()
+        if self.mode == "frozen":
+            return stored
+        return fast_copy(value)
+
+    def _evict(self) -> None:
+        entries = self._entries
+        while len(entries) > self.max_entries or self.current_bytes > self.max_cache_bytes:
+            _, (_, _, size) = entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+        }
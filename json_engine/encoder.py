@@ -1,8 +1,256 @@
-from typing import Any
+import dataclasses
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import numpy  # type: ignore
+except ImportError:
+    numpy = None
+
+_ESCAPES = {
+    "\\": "\\\\",
+    '"': '\\"',
+    "\n": "\\n",
+    "\r": "\\r",
+    "\t": "\\t",
+    "\b": "\\b",
+    "\f": "\\f",
+    "'": "\\u0027",
+}
+
+_ESCAPE_RE = re.compile(r"[\x00-\x1f\\\"']")
+_ESCAPE_ASCII_RE = re.compile(r"[\x00-\x1f\\\"']|[^\x00-\x7f]")
+
+
+def _escape_char(m: "re.Match[str]") -> str:
+    ch = m.group(0)
+    escaped = _ESCAPES.get(ch)
+    if escaped is not None:
+        return escaped
+    n = ord(ch)
+    if n > 0xFFFF:
+        n -= 0x10000
+        escaped = f"\\u{0xD800 | (n >> 10):04x}\\u{0xDC00 | (n & 0x3FF):04x}"
+    else:
+        escaped = f"\\u{n:04x}"
+        if n < 0x20:
+            _ESCAPES[ch] = escaped
+    return escaped
+
+
+def _encode_str(s: str) -> str:
+    if _ESCAPE_RE.search(s) is None:
+        return '"' + s + '"'
+    return '"' + _ESCAPE_RE.sub(_escape_char, s) + '"'
+
+
+def _encode_str_ascii(s: str) -> str:
+    if s.isascii():
+        return _encode_str(s)
+    return '"' + _ESCAPE_ASCII_RE.sub(_escape_char, s) + '"'
+
+
+def _item_key(item: Tuple[Any, Any]) -> Any:
+    key = item[0]
+    if not isinstance(key, str):
+        raise TypeError("Keys must be strings")
+    return key
+
+
+_INFINITY = float("inf")
+_NAN_POLICIES = ("raise", "null", "literal")
+_float_repr = float.__repr__
+_NUMBER_TYPES = frozenset((int, float))
+# Typed buffers are written through tolist(), which converts to Python
+# numbers in C and lets _join_numbers format the result in one pass.
+_BUFFER_TYPES: Tuple[type, ...] = (array, memoryview)
+if numpy is not None:
+    _BUFFER_TYPES += (numpy.ndarray, numpy.generic)
+
+
+def _nonfinite_literal(obj: float) -> str:
+    if obj != obj:
+        return "NaN"
+    return "Infinity" if obj > 0 else "-Infinity"
+
+
+_MISSING = object()
+# cls -> attribute names to write, or None when cls is not a dataclass or a
+# fully slotted class with public slots. Computed once per class and shared
+# by all encoders.
+_FIELD_NAMES: Dict[type, Optional[Tuple[str, ...]]] = {}
+
+
+def _field_names(cls: type) -> Optional[Tuple[str, ...]]:
+    try:
+        return _FIELD_NAMES[cls]
+    except KeyError:
+        pass
+    names: Optional[Tuple[str, ...]] = None
+    if dataclasses.is_dataclass(cls):
+        names = tuple(f.name for f in dataclasses.fields(cls))
+    elif cls.__mro__[:-1] and all("__slots__" in k.__dict__ for k in cls.__mro__[:-1]):
+        slots: List[str] = []
+        for klass in reversed(cls.__mro__[:-1]):
+            declared = klass.__dict__["__slots__"]
+            for name in (declared,) if isinstance(declared, str) else declared:
+                if not name.startswith("_") and name not in slots:
+                    slots.append(name)
+        names = tuple(slots) or None
+    _FIELD_NAMES[cls] = names
+    return names
+
+
+# Written out verbatim: the text is neither validated nor escaped, so
+# ensure_ascii does not apply to it.
+class RawJSON(str):
+    __slots__ = ()
+
+
+# Base of the proxies returned by lazy decoding. _source_text() is the JSON
+# text the value was decoded from, or None once its members have been read.
+class _LazyValue:
+    __slots__ = ()
+
+    def _source_text(self) -> Optional[str]:
+        raise NotImplementedError
+
+
+class EncodeCache:
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # id(obj) -> [obj, encoded text or None, separator key of the text];
+        # holding obj keeps its id stable.
+        self._entries: OrderedDict[int, List[Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark(self, obj: Any) -> Any:
+        if not isinstance(obj, (list, dict)):
+            raise TypeError("Only lists and dicts can be memoized")
+        with self._lock:
+            if id(obj) not in self._entries:
+                self._entries[id(obj)] = [obj, None, None]
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return obj
+
+    def invalidate(self, obj: Any) -> None:
+        with self._lock:
+            entry = self._entries.get(id(obj))
+            if entry is not None:
+                entry[1] = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, obj: Any) -> bool:
+        return id(obj) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def text(self, obj: Any, encoder: "JSONEncoder") -> str:
+        key = id(obj)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry[1] is not None and entry[2] == encoder._cache_key:
+                    self.hits += 1
+                    return entry[1]
+            self.misses += 1
+        if isinstance(obj, list):
+            encoded = "".join(encoder._iterencode_list(obj))
+        else:
+            encoded = "".join(encoder._iterencode_dict(obj))
+        if entry is not None:
+            entry[1] = encoded
+            entry[2] = encoder._cache_key
+        return encoded
 
 
 class JSONEncoder:
+    def __init__(
+        self,
+        cache: Optional[EncodeCache] = None,
+        indent: Union[int, str, None] = None,
+        separators: Optional[Tuple[str, str]] = None,
+        sort_keys: bool = False,
+        ensure_ascii: bool = False,
+        allow_nan: Union[bool, str] = "raise",
+    ):
+        # Booleans match the decoder's allow_nan flag.
+        if allow_nan is True:
+            allow_nan = "literal"
+        elif allow_nan is False:
+            allow_nan = "raise"
+        if allow_nan not in _NAN_POLICIES:
+            raise ValueError(f"allow_nan must be one of {_NAN_POLICIES}")
+        self.cache = cache
+        if isinstance(indent, int):
+            indent = " " * indent
+        self.indent = indent
+        if separators is not None:
+            self.item_separator, self.key_separator = separators
+        elif indent is not None:
+            self.item_separator, self.key_separator = ",", ": "
+        else:
+            self.item_separator, self.key_separator = ", ", ": "
+        self.sort_keys = sort_keys
+        self.ensure_ascii = ensure_ascii
+        self._copy_lazy_source = indent is None and not sort_keys and not ensure_ascii
+        self._escape = _encode_str_ascii if ensure_ascii else _encode_str
+        self.allow_nan = allow_nan
+        # cls -> [(attribute, escaped key + key separator)] for this encoder.
+        self._plans: Dict[type, Optional[List[Tuple[str, str]]]] = {}
+        self._cache_key = (
+            self.item_separator,
+            self.key_separator,
+            sort_keys,
+            ensure_ascii,
+            allow_nan,
+        )
+
     def encode(self, obj: Any) -> str:
+        if isinstance(obj, str):
+            return obj if type(obj) is RawJSON else self._escape(obj)
+        return "".join(self.iterencode(obj))
+
+    def encode_bytes(self, obj: Any) -> bytes:
+        return self.encode(obj).encode("utf-8")
+
+    def iterencode(self, obj: Any) -> Iterator[str]:
+        if self.indent is not None:
+            if isinstance(obj, _BUFFER_TYPES):
+                obj = obj.tolist()
+            if isinstance(obj, list):
+                return self._iterencode_list_indent(obj, 0)
+            if isinstance(obj, dict):
+                return self._iterencode_dict_indent(obj, 0)
+            if isinstance(obj, _LazyValue):
+                return self._iterencode_lazy_indent(obj, 0)
+            fields = self._object_fields(obj)
+            if fields is not None:
+                return self._iterencode_dict_indent(fields, 0)
+            return iter((self._encode_scalar(obj),))
+        if self.cache is not None and obj in self.cache:
+            return iter((self.cache.text(obj, self),))
+        if isinstance(obj, list):
+            return self._iterencode_list(obj)
+        if isinstance(obj, dict):
+            return self._iterencode_dict(obj)
+        return iter((self._encode_scalar(obj),))
+
+    def _encode_scalar(self, obj: Any) -> str:
         if obj is None:
             return "null"
         if isinstance(obj, bool):
@@ -10,34 +258,220 @@ class JSONEncoder:
         if isinstance(obj, int):
             return str(obj)
         if isinstance(obj, float):
-            return str(obj)
+            if obj != obj or obj == _INFINITY or obj == -_INFINITY:
+                return self._encode_nonfinite(obj)
+            return _float_repr(obj)
         if isinstance(obj, str):
-            esc_map = {
-                "\\": "\\\\",
-                '"': '\\"',
-                "\n": "\\n",
-                "\r": "\\r",
-                "\t": "\\t",
-                "\b": "\\b",
-                "\f": "\\f",
-                "'": "\\u0027",
-            }
-            out = []
-            for ch in obj:
-                if ch in esc_map:
-                    out.append(esc_map[ch])
-                elif ord(ch) < 0x20:
-                    out.append(f"\\u{ord(ch):04x}")
-                else:
-                    out.append(ch)
-            return f'"{"".join(out)}"'
-        if isinstance(obj, list):
-            return "[" + ", ".join(self.encode(x) for x in obj) + "]"
-        if isinstance(obj, dict):
-            items = []
-            for k, v in obj.items():
-                if not isinstance(k, str):
-                    raise TypeError("Keys must be strings")
-                items.append(f"{self.encode(k)}: {self.encode(v)}")
-            return "{" + ", ".join(items) + "}"
+            return obj if type(obj) is RawJSON else self._escape(obj)
+        if isinstance(obj, _BUFFER_TYPES):
+            return "".join(self.iterencode(obj.tolist()))
+        if isinstance(obj, _LazyValue):
+            return "".join(self._iterencode_lazy(obj))
+        plan = self._plan(type(obj))
+        if plan is not None:
+            return "".join(self._iterencode_object(obj, plan))
         raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def _plan(self, cls: type) -> Optional[List[Tuple[str, str]]]:
+        try:
+            return self._plans[cls]
+        except KeyError:
+            pass
+        names = _field_names(cls)
+        plan = None
+        if names is not None:
+            if self.sort_keys:
+                names = tuple(sorted(names))
+            plan = [(name, self._escape(name) + self.key_separator) for name in names]
+        self._plans[cls] = plan
+        return plan
+
+    def _object_fields(self, obj: Any) -> Optional[dict]:
+        plan = self._plan(type(obj))
+        if plan is None:
+            return None
+        fields = {}
+        for name, _ in plan:
+            value = getattr(obj, name, _MISSING)
+            if value is not _MISSING:
+                fields[name] = value
+        return fields
+
+    def _iterencode_object(self, obj: Any, plan: List[Tuple[str, str]]) -> Iterator[str]:
+        sep = "{"
+        item_sep = self.item_separator
+        cache = self.cache
+        for name, key in plan:
+            value = getattr(obj, name, _MISSING)
+            if value is _MISSING:
+                continue
+            prefix = sep + key
+            if cache is not None and value in cache:
+                yield prefix + cache.text(value, self)
+            elif isinstance(value, list):
+                yield prefix
+                yield from self._iterencode_list(value)
+            elif isinstance(value, dict):
+                yield prefix
+                yield from self._iterencode_dict(value)
+            else:
+                yield prefix + self._encode_scalar(value)
+            sep = item_sep
+        yield "{}" if sep == "{" else "}"
+
+    # An untouched lazy value is copied from its source unless the output is
+    # reformatted; otherwise it is walked like the dict or list it stands for.
+    def _iterencode_lazy(self, obj: _LazyValue) -> Iterator[str]:
+        text = obj._source_text() if self._copy_lazy_source else None
+        if text is not None:
+            return iter((text,))
+        if isinstance(obj, Mapping):
+            return self._iterencode_dict(obj)
+        return self._iterencode_list(obj)
+
+    def _iterencode_lazy_indent(self, obj: _LazyValue, level: int) -> Iterator[str]:
+        if isinstance(obj, Mapping):
+            return self._iterencode_dict_indent(obj, level)
+        return self._iterencode_list_indent(obj, level)
+
+    def _encode_nonfinite(self, obj: float) -> str:
+        if self.allow_nan == "null":
+            return "null"
+        if self.allow_nan == "literal":
+            return _nonfinite_literal(obj)
+        raise ValueError(f"Out of range float values are not JSON compliant: {obj!r}")
+
+    # Lists made only of exact ints and floats are joined in one go; repr()
+    # of a finite float or an int never contains "n", while "nan"/"inf" do.
+    def _join_numbers(self, lst: list, sep: str) -> Optional[str]:
+        types = set(map(type, lst))
+        if not types <= _NUMBER_TYPES:
+            return None
+        text = sep.join(map(repr, lst))
+        if "n" in text:
+            return None
+        return text
+
+    def _iterencode_list(self, lst: list) -> Iterator[str]:
+        if not lst:
+            yield "[]"
+            return
+        item_sep = self.item_separator
+        if type(lst[0]) in _NUMBER_TYPES:
+            text = self._join_numbers(lst, item_sep)
+            if text is not None:
+                yield "[" + text + "]"
+                return
+        sep = "["
+        cache = self.cache
+        for value in lst:
+            if cache is not None and value in cache:
+                yield sep + cache.text(value, self)
+            elif isinstance(value, list):
+                yield sep
+                yield from self._iterencode_list(value)
+            elif isinstance(value, dict):
+                yield sep
+                yield from self._iterencode_dict(value)
+            else:
+                yield sep + self._encode_scalar(value)
+            sep = item_sep
+        yield "]"
+
+    def _iterencode_dict(self, dct: dict) -> Iterator[str]:
+        if not dct:
+            yield "{}"
+            return
+        sep = "{"
+        item_sep = self.item_separator
+        key_sep = self.key_separator
+        cache = self.cache
+        escape = self._escape
+        items = sorted(dct.items(), key=_item_key) if self.sort_keys else dct.items()
+        for key, value in items:
+            if not isinstance(key, str):
+                raise TypeError("Keys must be strings")
+            prefix = sep + escape(key) + key_sep
+            if cache is not None and value in cache:
+                yield prefix + cache.text(value, self)
+            elif isinstance(value, list):
+                yield prefix
+                yield from self._iterencode_list(value)
+            elif isinstance(value, dict):
+                yield prefix
+                yield from self._iterencode_dict(value)
+            else:
+                yield prefix + self._encode_scalar(value)
+            sep = item_sep
+        yield "}"
+
+    # Indented output never consults the EncodeCache: the text of a subtree
+    # depends on the nesting level it is written at.
+    def _iterencode_list_indent(self, lst: list, level: int) -> Iterator[str]:
+        if not lst:
+            yield "[]"
+            return
+        newline = "\n" + self.indent * (level + 1)
+        item_sep = self.item_separator + newline
+        if type(lst[0]) in _NUMBER_TYPES:
+            text = self._join_numbers(lst, item_sep)
+            if text is not None:
+                yield "[" + newline + text + "\n" + self.indent * level + "]"
+                return
+        sep = "[" + newline
+        for value in lst:
+            if isinstance(value, _BUFFER_TYPES):
+                value = value.tolist()
+            if isinstance(value, list):
+                yield sep
+                yield from self._iterencode_list_indent(value, level + 1)
+            elif isinstance(value, dict):
+                yield sep
+                yield from self._iterencode_dict_indent(value, level + 1)
+            elif isinstance(value, _LazyValue):
+                yield sep
+                yield from self._iterencode_lazy_indent(value, level + 1)
+            else:
+                fields = self._object_fields(value)
+                if fields is None:
+                    yield sep + self._encode_scalar(value)
+                else:
+                    yield sep
+                    yield from self._iterencode_dict_indent(fields, level + 1)
+            sep = item_sep
+        yield "\n" + self.indent * level + "]"
+
+    def _iterencode_dict_indent(self, dct: dict, level: int) -> Iterator[str]:
+        if not dct:
+            yield "{}"
+            return
+        newline = "\n" + self.indent * (level + 1)
+        sep = "{" + newline
+        item_sep = self.item_separator + newline
+        key_sep = self.key_separator
+        escape = self._escape
+        items = sorted(dct.items(), key=_item_key) if self.sort_keys else dct.items()
+        for key, value in items:
+            if not isinstance(key, str):
+                raise TypeError("Keys must be strings")
+            prefix = sep + escape(key) + key_sep
+            if isinstance(value, _BUFFER_TYPES):
+                value = value.tolist()
+            if isinstance(value, list):
+                yield prefix
+                yield from self._iterencode_list_indent(value, level + 1)
+            elif isinstance(value, dict):
+                yield prefix
+                yield from self._iterencode_dict_indent(value, level + 1)
+            elif isinstance(value, _LazyValue):
+                yield prefix
+                yield from self._iterencode_lazy_indent(value, level + 1)
+            else:
+                fields = self._object_fields(value)
+                if fields is None:
+                    yield prefix + self._encode_scalar(value)
+                else:
+                    yield prefix
+                    yield from self._iterencode_dict_indent(fields, level + 1)
+            sep = item_sep
+        yield "\n" + self.indent * level + "}"
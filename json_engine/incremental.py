@@ -0,0 +1,255 @@
+import re
+from typing import Any, List, Optional, Tuple
+
+from .parser import _token_error, to_number
+from .tokenizer import Token, TokenizeError, tokenize
+
+Event = Tuple[str, str, Any]
+
+# A NUMBER or INVALID token that runs up to the end of the buffer may just be
+# cut by the chunk boundary ("12" of "123", "tr" of "true").
+_PARTIAL_RE = re.compile(r"[-+.eE0-9]*|t(?:r(?:u)?)?|f(?:a(?:l(?:s)?)?)?|n(?:u(?:l)?)?")
+# The inside of a string up to its closing quote, or up to a backslash whose
+# escaped character has not arrived yet.
+_STRING_BODY_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.S)
+
+_SCALAR_EVENTS = {
+    "STRING": "string",
+    "NUMBER": "number",
+    "TRUE": "boolean",
+    "FALSE": "boolean",
+    "NULL": "null",
+}
+
+_VALUE = 0
+_KEY_OR_END = 1
+_KEY = 2
+_COLON = 3
+_OBJECT_SEP = 4
+_VALUE_OR_END = 5
+_ARRAY_SEP = 6
+_DONE = 7
+
+
+class IncrementalParser:
+    def __init__(self):
+        self._buffer = ""
+        # Chunks of a string that is still open, kept unjoined so that a long
+        # string is scanned and copied once rather than on every feed.
+        self._string_chunks: Optional[List[str]] = None
+        self._string_escape = False
+        # Stream position of self._buffer[0], for error messages.
+        self._line = 1
+        self._column = 1
+        self._offset = 0
+        self._state = _VALUE
+        self._stack: List[str] = []
+        self._prefixes: List[str] = []
+        self._prefix = ""
+
+    def feed(self, data: str) -> List[Event]:
+        chunks = self._string_chunks
+        if chunks is None:
+            self._buffer += data
+            return self._drain(final=False)
+        chunks.append(data)
+        if not self._string_closed(data):
+            return []
+        self._buffer = "".join(chunks)
+        self._string_chunks = None
+        return self._drain(final=False)
+
+    def close(self) -> List[Event]:
+        if self._string_chunks is not None:
+            self._buffer = "".join(self._string_chunks)
+            self._string_chunks = None
+        events = self._drain(final=True)
+        if self._state != _DONE:
+            raise TokenizeError("Unexpected token", -1, -1)
+        return events
+
+    def _string_closed(self, data: str, start: int = 0) -> bool:
+        if self._string_escape and start < len(data):
+            start += 1
+            self._string_escape = False
+        end = _STRING_BODY_RE.match(data, start).end()
+        if end < len(data) and data[end] == '"':
+            return True
+        # Either the data ran out or it ends in a lone backslash.
+        self._string_escape = end < len(data)
+        return False
+
+    def _drain(self, final: bool) -> List[Event]:
+        buf = self._buffer
+        events: List[Event] = []
+        consumed = 0
+        try:
+            for tok in tokenize(buf, strict=False):
+                if (
+                    not final
+                    and tok.type in ("NUMBER", "INVALID")
+                    and _PARTIAL_RE.fullmatch(buf, tok.offset)
+                ):
+                    break
+                self._handle(tok, events)
+                consumed = tok.end
+            else:
+                consumed = len(buf)
+        except TokenizeError as exc:
+            if final or not (
+                exc.msg.startswith("Unterminated")
+                or (exc.msg == "Invalid unicode escape" and exc.offset + 5 > len(buf))
+            ):
+                raise self._stream_error(exc) from None
+            # Every error let through here comes from a string cut off by the
+            # chunk boundary; keep collecting it until its closing quote arrives.
+            self._string_escape = False
+            if not self._string_closed(buf, buf.index('"', consumed) + 1):
+                self._string_chunks = [buf[consumed:]]
+        self._advance(buf, consumed)
+        self._buffer = buf[consumed:] if self._string_chunks is None else ""
+        return events
+
+    def _advance(self, buf: str, consumed: int) -> None:
+        newlines = buf.count("\n", 0, consumed)
+        if newlines:
+            self._line += newlines
+            self._column = consumed - buf.rfind("\n", 0, consumed)
+        else:
+            self._column += consumed
+        self._offset += consumed
+
+    def _stream_error(self, exc: TokenizeError) -> TokenizeError:
+        # Positions from tokenize() are relative to the retained buffer.
+        if exc.line == -1:
+            return exc
+        column = exc.column + self._column - 1 if exc.line == 1 else exc.column
+        return type(exc)(exc.msg, self._line + exc.line - 1, column, self._offset + exc.offset)
+
+    def _handle(self, tok: Token, events: List[Event]) -> None:
+        state = self._state
+        ttype = tok.type
+        if state == _VALUE or (state == _VALUE_OR_END and ttype != "]"):
+            self._value(tok, events)
+        elif state == _KEY_OR_END or state == _KEY:
+            if ttype == "STRING":
+                parent = self._prefixes[-1]
+                events.append((parent, "map_key", tok.value))
+                self._prefix = f"{parent}.{tok.value}" if parent else tok.value
+                self._state = _COLON
+            elif ttype == "}" and state == _KEY_OR_END:
+                self._end(events, "end_map")
+            elif ttype in {":", "}", ",", "INVALID"}:
+                raise _token_error("Unexpected token", tok)
+            else:
+                raise _token_error("Expected string as object key", tok)
+        elif state == _COLON:
+            if ttype != ":":
+                raise _token_error("Expected ':' after object key", tok)
+            self._state = _VALUE
+        elif state == _OBJECT_SEP:
+            if ttype == ",":
+                self._state = _KEY
+            elif ttype == "}":
+                self._end(events, "end_map")
+            else:
+                raise _token_error("Expected ',' or '}' in object", tok)
+        elif state == _VALUE_OR_END:
+            self._end(events, "end_array")
+        elif state == _ARRAY_SEP:
+            if ttype == ",":
+                self._state = _VALUE
+            elif ttype == "]":
+                self._end(events, "end_array")
+            else:
+                raise _token_error("Expected ',' or ']' in array", tok)
+        else:
+            raise _token_error("Extra data", tok)
+
+    def _value(self, tok: Token, events: List[Event]) -> None:
+        ttype = tok.type
+        prefix = self._prefix
+        if ttype == "{":
+            events.append((prefix, "start_map", None))
+            self._stack.append("{")
+            self._prefixes.append(prefix)
+            self._state = _KEY_OR_END
+        elif ttype == "[":
+            events.append((prefix, "start_array", None))
+            self._stack.append("[")
+            self._prefixes.append(prefix)
+            self._prefix = f"{prefix}.item" if prefix else "item"
+            self._state = _VALUE_OR_END
+        elif ttype in _SCALAR_EVENTS:
+            if ttype == "NUMBER":
+                value: Any = to_number(tok.value)
+            elif ttype == "STRING":
+                value = tok.value
+            else:
+                value = {"TRUE": True, "FALSE": False, "NULL": None}[ttype]
+            events.append((prefix, _SCALAR_EVENTS[ttype], value))
+            self._after_value()
+        else:
+            raise _token_error("Unexpected token", tok)
+
+    def _end(self, events: List[Event], event: str) -> None:
+        self._stack.pop()
+        self._prefix = self._prefixes.pop()
+        events.append((self._prefix, event, None))
+        self._after_value()
+
+    def _after_value(self) -> None:
+        if not self._stack:
+            self._state = _DONE
+        elif self._stack[-1] == "{":
+            self._state = _OBJECT_SEP
+        else:
+            self._state = _ARRAY_SEP
+
+
+class ItemBuilder:
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self._containers: List[Any] = []
+        self._keys: List[Any] = []
+
+    def push(self, events: List[Event]) -> List[Any]:
+        items = []
+        containers = self._containers
+        keys = self._keys
+        for prefix, event, value in events:
+            if not containers:
+                if prefix != self.prefix:
+                    continue
+                if event == "start_map":
+                    containers.append({})
+                    keys.append(None)
+                elif event == "start_array":
+                    containers.append([])
+                    keys.append(None)
+                elif event not in ("map_key", "end_map", "end_array"):
+                    items.append(value)
+                continue
+
+            if event == "map_key":
+                keys[-1] = value
+                continue
+            if event == "end_map" or event == "end_array":
+                done = containers.pop()
+                keys.pop()
+                if not containers:
+                    items.append(done)
+                continue
+            if event == "start_map":
+                value = {}
+            elif event == "start_array":
+                value = []
+            top = containers[-1]
+            if type(top) is list:
+                top.append(value)
+            else:
+                top[keys[-1]] = value
+            if event == "start_map" or event == "start_array":
+                containers.append(value)
+                keys.append(None)
+        return items
@@ -0,0 +1,200 @@
+import re
+from array import array
+from typing import Any, Dict, Iterator, Optional, Union
+
+from .parser import JSONDecoder
+from .tokenizer import TokenizeError, _position_error
+
+# The last two alternatives catch an unterminated string and any character
+# that cannot appear here (such as a second separator), so no input is skipped.
+_STRUCTURE_RE = re.compile(
+    r'\s*([:,]?)\s*(?:("[^"\\]*(?:\\.[^"\\]*)*"|[^\s{}\[\]:,"]+)|([{\[])|([}\]])|(")|(\S))'
+)
+_SEPARATOR, _VALUE, _OPEN, _CLOSE, _QUOTE = 1, 2, 3, 4, 5
+
+
+# Tape layout: offsets[k] is the input offset of the k-th bracket or value
+# start; links[k] is the tape index of the matching bracket for brackets and
+# the end offset of the value for strings and other scalars.
+class JSONIndex:
+    def __init__(self, s: str):
+        if s is None or s == "":
+            raise ValueError("Empty string")
+        self.source = s
+        self.offsets = array("q")
+        self.links = array("q")
+        self._decoder = JSONDecoder()
+        self._objects: Dict[int, Dict[str, int]] = {}
+        self._arrays: Dict[int, array] = {}
+        self._build()
+
+    def _build(self) -> None:
+        s = self.source
+        offsets = self.offsets
+        links = self.links
+        add_offset = offsets.append
+        add_link = links.append
+        stack = []
+        # expect is the separator that must precede the next child of the
+        # innermost container: "" for the first one, then "," in arrays and
+        # alternately ":" and "," in objects. Enclosing states wait in saved.
+        saved = []
+        expect = ""
+        in_object = False
+        for m in _STRUCTURE_RE.finditer(s):
+            kind = m.lastindex
+            start = m.start(kind)
+            sep = m[_SEPARATOR]
+            if kind == _CLOSE:
+                if not stack or in_object != (s[start] == "}"):
+                    raise _position_error("Unexpected token", s, start)
+                if sep or expect == ":":
+                    raise _position_error("Unexpected token", s, m.start(_SEPARATOR))
+                open_idx = stack.pop()
+                expect, in_object = saved.pop()
+                links[open_idx] = len(offsets)
+                add_offset(start)
+                add_link(open_idx)
+                continue
+            if not stack and offsets:
+                raise _position_error("Extra data", s, m.start(_SEPARATOR) if sep else start)
+            if sep != expect:
+                if sep:
+                    raise _position_error("Unexpected token", s, m.start(_SEPARATOR))
+                raise _position_error(f"Expected {expect!r}", s, start)
+            if in_object and expect != ":":
+                expect = ":"
+            else:
+                expect = ","
+            if kind == _VALUE:
+                add_offset(start)
+                add_link(m.end())
+            elif kind == _OPEN:
+                stack.append(len(offsets))
+                saved.append((expect, in_object))
+                expect = ""
+                in_object = s[start] == "{"
+                add_offset(start)
+                add_link(-1)
+            elif kind == _QUOTE:
+                raise _position_error("Unterminated string", s, start)
+            else:
+                raise _position_error("Unexpected token", s, start)
+        if stack:
+            raise TokenizeError("Unexpected token", -1, -1)
+        if not offsets:
+            raise TokenizeError("Unexpected token", -1, -1)
+        if self._next(0) != len(offsets):
+            raise _position_error("Extra data", s, offsets[self._next(0)])
+
+    def _next(self, k: int) -> int:
+        ch = self.source[self.offsets[k]]
+        if ch == "{" or ch == "[":
+            return self.links[k] + 1
+        return k + 1
+
+    def _decode_at(self, k: int) -> Any:
+        return self._decoder.raw_decode(self.source, self.offsets[k])[0]
+
+    def _key_at(self, k: int) -> str:
+        start = self.offsets[k]
+        end = self.links[k]
+        raw = self.source[start + 1 : end - 1]
+        if "\\" not in raw and self.source[start] == '"':
+            return raw
+        key = self._decode_at(k)
+        if not isinstance(key, str):
+            raise _position_error("Expected string as object key", self.source, start)
+        return key
+
+    def _object_members(self, k: int) -> Dict[str, int]:
+        members = self._objects.get(k)
+        if members is None:
+            members = {}
+            end = self.links[k]
+            j = k + 1
+            while j < end:
+                members[self._key_at(j)] = j + 1
+                j = self._next(j + 1)
+            self._objects[k] = members
+        return members
+
+    def _array_items(self, k: int) -> array:
+        items = self._arrays.get(k)
+        if items is None:
+            items = array("q")
+            end = self.links[k]
+            j = k + 1
+            while j < end:
+                items.append(j)
+                j = self._next(j)
+            self._arrays[k] = items
+        return items
+
+    def node(self, k: int) -> Union["IndexedNode", Any]:
+        ch = self.source[self.offsets[k]]
+        if ch == "{" or ch == "[":
+            return IndexedNode(self, k)
+        return self._decode_at(k)
+
+    @property
+    def root(self) -> Union["IndexedNode", Any]:
+        return self.node(0)
+
+    def __getitem__(self, key: Any) -> Any:
+        return IndexedNode(self, 0)[key]
+
+
+class IndexedNode:
+    def __init__(self, index: JSONIndex, k: int):
+        self._index = index
+        self._k = k
+
+    @property
+    def is_object(self) -> bool:
+        return self._index.source[self._index.offsets[self._k]] == "{"
+
+    def __getitem__(self, key: Any) -> Any:
+        index = self._index
+        if self.is_object:
+            if not isinstance(key, str):
+                raise TypeError("Object keys must be strings")
+            return index.node(index._object_members(self._k)[key])
+        if not isinstance(key, int):
+            raise TypeError("Array indices must be integers")
+        return index.node(index._array_items(self._k)[key])
+
+    def get(self, key: Any, default: Optional[Any] = None) -> Any:
+        try:
+            return self[key]
+        except (KeyError, IndexError):
+            return default
+
+    def __contains__(self, key: Any) -> bool:
+        if self.is_object:
+            return key in self._index._object_members(self._k)
+        return any(self._index.node(j) == key for j in self._index._array_items(self._k))
+
+    def __len__(self) -> int:
+        if self.is_object:
+            return len(self._index._object_members(self._k))
+        return len(self._index._array_items(self._k))
+
+    def __iter__(self) -> Iterator[Any]:
+        if self.is_object:
+            return iter(self._index._object_members(self._k))
+        return (self._index.node(j) for j in self._index._array_items(self._k))
+
+    def keys(self) -> Iterator[str]:
+        return iter(self._index._object_members(self._k))
+
+    def value(self) -> Any:
+        return self._index._decode_at(self._k)
+
+    def __repr__(self):
+        kind = "object" if self.is_object else "array"
+        return f"IndexedNode({kind}, offset={self._index.offsets[self._k]})"
+
+
+def build_index(s: str) -> JSONIndex:
+    return JSONIndex(s)
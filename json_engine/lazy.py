@@ -0,0 +1,177 @@
+import re
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Optional
+
+from .encoder import _LazyValue
+from .parser import JSONDecoder, _token_error
+from .tokenizer import Token, TokenizeError, _relocate_error, skip_value, tokenize
+
+_WHITESPACE_RE = re.compile(r"[ \t\r\n]*")
+_EOF = Token("EOF", "", -1, -1)
+_decoder = JSONDecoder()
+
+
+def _send(tokens: Any, offset: int) -> Token:
+    try:
+        return tokens.send(offset)
+    except StopIteration:
+        return _EOF
+
+
+def _materialize(source: str, offset: int) -> Any:
+    pos = _WHITESPACE_RE.match(source, offset).end()
+    ch = source[pos : pos + 1]
+    if ch == "{":
+        return LazyObject(source, pos)
+    if ch == "[":
+        return LazyArray(source, pos)
+    return _decoder.raw_decode(source, pos)[0]
+
+
+class LazyObject(_LazyValue, Mapping):
+    def __init__(self, source: str, offset: int):
+        self._source = source
+        self._offset = offset
+        self._members: Optional[Dict[str, int]] = None
+        self._cache: Dict[str, Any] = {}
+
+    def _scan(self) -> Dict[str, int]:
+        members: Dict[str, int] = {}
+        source = self._source
+        tokens = tokenize(source, strict=False, start=self._offset, line=1, column=1)
+        next(tokens)
+        key_tok = next(tokens, _EOF)
+        if key_tok.type == "}":
+            return members
+        while True:
+            if key_tok.type != "STRING":
+                raise _token_error("Expected string as object key", key_tok)
+            colon_tok = next(tokens, _EOF)
+            if colon_tok.type != ":":
+                raise _token_error("Expected ':' after object key", colon_tok)
+            members[key_tok.value] = colon_tok.end
+            sep = _send(tokens, skip_value(source, colon_tok.end))
+            if sep.type == ",":
+                key_tok = next(tokens, _EOF)
+                continue
+            if sep.type == "}":
+                return members
+            raise _token_error("Expected ',' or '}' in object", sep)
+
+    def _index(self) -> Dict[str, int]:
+        if self._members is None:
+            try:
+                self._members = self._scan()
+            except TokenizeError as exc:
+                raise _relocate_error(exc, self._source) from None
+        return self._members
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        value = _materialize(self._source, self._index()[key])
+        self._cache[key] = value
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index())
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def materialize(self) -> Dict[str, Any]:
+        return _decoder.raw_decode(self._source, self._offset)[0]
+
+    def _source_text(self) -> Optional[str]:
+        if self._members is not None:
+            return None
+        return self._source[self._offset : skip_value(self._source, self._offset)]
+
+    def __repr__(self):
+        return f"LazyObject(offset={self._offset})"
+
+
+class LazyArray(_LazyValue, Sequence):
+    def __init__(self, source: str, offset: int):
+        self._source = source
+        self._offset = offset
+        self._items: Optional[List[int]] = None
+        self._cache: Dict[int, Any] = {}
+
+    def _scan(self) -> List[int]:
+        items: List[int] = []
+        source = self._source
+        tokens = tokenize(source, strict=False, start=self._offset, line=1, column=1)
+        pos = next(tokens).end
+        if source.startswith("]", _WHITESPACE_RE.match(source, pos).end()):
+            return items
+        while True:
+            items.append(pos)
+            sep = _send(tokens, skip_value(source, pos))
+            if sep.type == ",":
+                pos = sep.end
+                continue
+            if sep.type == "]":
+                return items
+            raise _token_error("Expected ',' or ']' in array", sep)
+
+    def _index(self) -> List[int]:
+        if self._items is None:
+            try:
+                self._items = self._scan()
+            except TokenizeError as exc:
+                raise _relocate_error(exc, self._source) from None
+        return self._items
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        items = self._index()
+        if index < 0:
+            index += len(items)
+        try:
+            return self._cache[index]
+        except KeyError:
+            pass
+        if not 0 <= index < len(items):
+            raise IndexError("LazyArray index out of range")
+        value = _materialize(self._source, items[index])
+        self._cache[index] = value
+        return value
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, LazyArray)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def materialize(self) -> List[Any]:
+        return _decoder.raw_decode(self._source, self._offset)[0]
+
+    def _source_text(self) -> Optional[str]:
+        if self._items is not None:
+            return None
+        return self._source[self._offset : skip_value(self._source, self._offset)]
+
+    def __repr__(self):
+        return f"LazyArray(offset={self._offset})"
+
+
+def lazy_loads(s: str) -> Any:
+    if s is None or s == "":
+        raise ValueError("Empty string")
+    start = _WHITESPACE_RE.match(s).end()
+    end = skip_value(s, start)
+    rest = _WHITESPACE_RE.match(s, end).end()
+    if rest != len(s):
+        raise _token_error("Extra data", next(tokenize(s, strict=False, start=rest)))
+    if s[start] == "{" or s[start] == "[":
+        return _materialize(s, start)
+    return _decoder.decode(s)
@@ -0,0 +1,107 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Iterable, Iterator, List, TextIO, Union
+
+from .encoder import JSONEncoder
+from .parser import JSONDecoder
+from .tokenizer import TokenizeError, _moved_error
+
+BLOCK_SIZE = 64 * 1024
+
+_worker_decoder = JSONDecoder()
+_traced_worker_decoder = JSONDecoder(trace=True)
+
+
+def _iter_lines(fp: TextIO, block_size: int) -> Iterator[List[str]]:
+    pending = ""
+    while True:
+        block = fp.read(block_size)
+        if not block:
+            break
+        lines = (pending + block).split("\n")
+        pending = lines.pop()
+        if lines:
+            yield lines
+    if pending:
+        yield [pending]
+
+
+def _decode_lines(
+    lines: List[str],
+    first_line: int,
+    first_offset: int = 0,
+    decoder: JSONDecoder = _worker_decoder,
+) -> List[Any]:
+    # Errors are reported at the stream line and offset; first_offset is the
+    # offset of lines[0] in the stream.
+    values = []
+    offset = first_offset
+    for lineno, line in enumerate(lines, start=first_line):
+        if line.strip():
+            try:
+                values.append(decoder.decode(line))
+            except TokenizeError as exc:
+                at = exc.offset if exc.offset < 0 else offset + exc.offset
+                raise _moved_error(exc, lineno, exc.column, at) from None
+        offset += len(line) + 1
+    return values
+
+
+def _decode_lines_in_worker(
+    lines: List[str], first_line: int, first_offset: int, trace: bool
+) -> List[Any]:
+    decoder = _traced_worker_decoder if trace else _worker_decoder
+    return _decode_lines(lines, first_line, first_offset, decoder)
+
+
+def _block_length(lines: List[str]) -> int:
+    return sum(map(len, lines)) + len(lines)
+
+
+def iter_ndjson(
+    fp: TextIO, *, workers: int = 0, block_size: int = BLOCK_SIZE, trace: bool = False
+) -> Iterator[Any]:
+    blocks = _iter_lines(fp, block_size)
+    if workers <= 0:
+        decoder = JSONDecoder(trace=trace)
+        lineno, offset = 1, 0
+        for lines in blocks:
+            yield from _decode_lines(lines, lineno, offset, decoder)
+            lineno += len(lines)
+            offset += _block_length(lines)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Deque[Future] = deque()
+        lineno, offset = 1, 0
+        for lines in blocks:
+            pending.append(executor.submit(_decode_lines_in_worker, lines, lineno, offset, trace))
+            lineno += len(lines)
+            offset += _block_length(lines)
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def dump_ndjson(
+    iterable: Iterable[Any],
+    fp: TextIO,
+    *,
+    block_size: int = BLOCK_SIZE,
+    allow_nan: Union[bool, str] = "raise",
+) -> None:
+    encode = JSONEncoder(allow_nan=allow_nan).encode
+    buffer: List[str] = []
+    size = 0
+    for obj in iterable:
+        line = encode(obj)
+        buffer.append(line)
+        buffer.append("\n")
+        size += len(line) + 1
+        if size >= block_size:
+            fp.write("".join(buffer))
+            buffer.clear()
+            size = 0
+    if buffer:
+        fp.write("".join(buffer))
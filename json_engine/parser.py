@@ -1,114 +1,623 @@
-from typing import Any, List
+import re
+import sys
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from .tokenizer import Token, TokenizeError, tokenize
+try:
+    import numpy  # type: ignore
+except ImportError:
+    numpy = None
+
+from .encoder import JSONEncoder, RawJSON
+from .tokenizer import (
+    LimitError,
+    Token,
+    TokenizeError,
+    _relocate_error,
+    skip_value,
+    tokenize,
+)
+from .validate import compile_schema
+
+_NUM = r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?"
+_NUMERIC_ARRAY_RE = re.compile(rf"[ \t\r\n]*({_NUM}(?:[ \t\r\n]*,[ \t\r\n]*{_NUM})*)[ \t\r\n]*\]")
+_NUMERIC_ARRAY_MODES = (None, "array", "numpy")
+
+
+def to_number(text: str) -> Any:
+    if "." in text or "e" in text or "E" in text:
+        return float(text)
+    try:
+        return int(text)
+    except Exception:
+        return float(text)
+
+
+def _token_error(message: str, tok: Token) -> TokenizeError:
+    return TokenizeError(message, tok.line, tok.column, tok.offset)
+
+
+def _normalize_include(spec: Any) -> Optional[Dict[str, Any]]:
+    if spec is None or spec is True:
+        return None
+    if isinstance(spec, dict):
+        return {key: _normalize_include(sub) for key, sub in spec.items()}
+    return dict.fromkeys(spec)
+
+
+_MAX_EXACT_FLOAT_INT = 2**53
+
+
+def _scan_numeric_array(source: str, start: int) -> Optional[Tuple[array, int]]:
+    # start is just past the '['; returns the values and the offset of the ']'.
+    m = _NUMERIC_ARRAY_RE.match(source, start)
+    if m is None:
+        return None
+    body = m.group(1)
+    parts = body.split(",")
+    if "." in body or "e" in body or "E" in body:
+        # A double holds integers exactly only up to 2**53; keep larger ones
+        # as ints in a list.
+        for part in parts:
+            if len(part) >= 16 and part.strip().lstrip("-").isdigit():
+                if abs(int(part)) > _MAX_EXACT_FLOAT_INT:
+                    return None
+        return array("d", map(float, parts)), m.end() - 1
+    try:
+        return array("q", map(int, parts)), m.end() - 1
+    except OverflowError:
+        return None
+
+
+_VALUE_TOKENS = frozenset(("{", "[", "STRING", "NUMBER", "TRUE", "FALSE", "NULL"))
+
+
+def _limit_error(message: str, tok: Token) -> LimitError:
+    return LimitError(message, tok.line, tok.column, tok.offset)
+
+
+_DUPLICATE_KEY_POLICIES = ("last", "first", "error", "collect")
+
+
+def _duplicate_handler(policy: str) -> Optional[Callable[[Dict[str, Any], str, Any, Token], None]]:
+    # None means last-wins: object parsers then store members without any check.
+    if policy == "last":
+        return None
+    if policy == "first":
+
+        def keep_first(obj, key, value, tok):
+            pass
+
+        return keep_first
+    if policy == "error":
+
+        def reject(obj, key, value, tok):
+            raise _token_error(f"Duplicate key {key!r}", tok)
+
+        return reject
+
+    # Lists created here are told apart from list values by identity; they
+    # stay alive inside their object for the whole parse.
+    collected = set()
+
+    def collect(obj, key, value, tok):
+        current = obj[key]
+        if id(current) in collected:
+            current.append(value)
+        else:
+            current = obj[key] = [current, value]
+            collected.add(id(current))
+
+    return collect
+
+
+_EOF = Token("EOF", "", -1, -1)
+
+
+class _Cursor:
+    # Per-call read position, so one decoder can serve concurrent calls.
+    __slots__ = ("tokens", "last")
+
+    def __init__(self, tokens: Iterator[Token]):
+        self.tokens = tokens
+        self.last = _EOF
+
+    def next(self) -> Token:
+        tok = next(self.tokens, None)
+        if tok is None:
+            return _EOF
+        self.last = tok
+        return tok
+
+
+def _skip_tokens(tok: Token, nxt) -> None:
+    if tok.type != "{" and tok.type != "[":
+        return
+    depth = 1
+    while depth:
+        t = nxt()
+        if t.type == "{" or t.type == "[":
+            depth += 1
+        elif t.type == "}" or t.type == "]":
+            depth -= 1
+        elif t.type == "EOF":
+            raise _token_error("Unexpected token", t)
 
 
 class JSONDecoder:
-    def __init__(self, trace: bool = False):
+    def __init__(
+        self,
+        trace: bool = False,
+        include: Any = None,
+        raw: Any = None,
+        allow_nan: bool = False,
+        numeric_arrays: Optional[str] = None,
+        validate: Any = None,
+        max_bytes: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        max_string_length: Optional[int] = None,
+        max_container_items: Optional[int] = None,
+        max_total_values: Optional[int] = None,
+        duplicate_keys: str = "last",
+        check_raw: bool = False,
+    ):
+        if sum(option is not None for option in (include, raw, validate)) > 1:
+            raise ValueError("include, raw and validate cannot be combined")
+        if numeric_arrays not in _NUMERIC_ARRAY_MODES:
+            raise ValueError(f"numeric_arrays must be one of {_NUMERIC_ARRAY_MODES}")
+        if duplicate_keys not in _DUPLICATE_KEY_POLICIES:
+            raise ValueError(f"duplicate_keys must be one of {_DUPLICATE_KEY_POLICIES}")
+        # The parser recurses twice per nesting level; deeper limits would end
+        # in RecursionError before they are reached.
+        depth_cap = (sys.getrecursionlimit() - 100) // 2
+        if max_depth is not None and max_depth > depth_cap:
+            raise ValueError(f"max_depth cannot exceed {depth_cap} (the recursion limit)")
+        if numeric_arrays == "numpy" and numpy is None:
+            raise ImportError("numeric_arrays='numpy' requires NumPy")
+        self.numeric_arrays = numeric_arrays
+        self.duplicate_keys = duplicate_keys
+        self.check_raw = check_raw
+        self.validate = compile_schema(validate) if validate is not None else None
         self.trace = trace
-        self.tokens: List[Token] = []
-        self.pos = 0
+        self.allow_nan = allow_nan
+        self.include = _normalize_include(include)
+        self.raw = _normalize_include(raw)
+        self.max_bytes = max_bytes
+        self.max_depth = max_depth
+        self.max_string_length = max_string_length
+        self.max_container_items = max_container_items
+        self.max_total_values = max_total_values
+        self.limited = any(
+            limit is not None for limit in (max_depth, max_container_items, max_total_values)
+        )
+        self._tokenize_options = {
+            "strict": False,
+            "allow_nan": allow_nan,
+            "max_string_length": max_string_length,
+        }
 
-    def _peek(self):
-        if self.pos < len(self.tokens):
-            return self.tokens[self.pos]
-        return Token("EOF", "", -1, -1)
+    def _limited_next(self, cursor: _Cursor) -> Callable[[], Token]:
+        # Open containers are tracked as [is_array, item count]. Items are
+        # counted on commas (plus the first one), values on ':' and on array
+        # items, so object keys are not counted as values.
+        max_depth = self.max_depth
+        max_items = self.max_container_items
+        max_values = self.max_total_values
+        read = cursor.next
+        stack: List[List[Any]] = []
+        values = 0
 
-    def _next(self):
-        tok = self._peek()
-        self.pos += 1
-        return tok
+        def check(tok: Token) -> Token:
+            nonlocal values
+            ttype = tok.type
+            if ttype in _VALUE_TOKENS:
+                if stack and stack[-1][1] == 0:
+                    top = stack[-1]
+                    top[1] = 1
+                    if top[0]:
+                        values += 1
+                elif not stack:
+                    values += 1
+                if ttype == "{" or ttype == "[":
+                    if max_depth is not None and len(stack) >= max_depth:
+                        raise _limit_error(f"Nesting deeper than {max_depth} levels", tok)
+                    stack.append([ttype == "[", 0])
+            elif ttype == ",":
+                if stack:
+                    top = stack[-1]
+                    top[1] += 1
+                    if max_items is not None and top[1] > max_items:
+                        raise _limit_error(f"Container has more than {max_items} items", tok)
+                    if top[0]:
+                        values += 1
+            elif ttype == ":":
+                values += 1
+            elif ttype == "}" or ttype == "]":
+                if stack:
+                    stack.pop()
+                return tok
+            else:
+                return tok
+            if max_values is not None and values > max_values:
+                raise _limit_error(f"More than {max_values} values", tok)
+            return tok
+
+        def bulk(count: int, tok: Token) -> None:
+            # A numeric array decoded in one step; its '[' was already seen.
+            nonlocal values
+            stack.pop()
+            if max_items is not None and count > max_items:
+                raise _limit_error(f"Container has more than {max_items} items", tok)
+            values += count
+            if max_values is not None and values > max_values:
+                raise _limit_error(f"More than {max_values} values", tok)
+
+        def nxt() -> Token:
+            return check(read())
+
+        nxt.check = check  # type: ignore
+        nxt.bulk = bulk  # type: ignore
+        return nxt
+
+    def _check_size(self, s: str, start: int = 0) -> None:
+        limit = self.max_bytes
+        size = len(s) - start
+        if size > limit or (size * 4 > limit and len(s[start:].encode("utf-8")) > limit):
+            end = start + limit
+            line = s.count("\n", 0, end) + 1
+            col = end - s.rfind("\n", 0, end)
+            raise LimitError(f"Input larger than {limit} bytes", line, col, end)
 
     def decode(self, s: str) -> Any:
         if s is None or s == "":
             raise ValueError("Empty string")
+        if self.max_bytes is not None:
+            self._check_size(s)
+
+        cursor = _Cursor(tokenize(s, **self._tokenize_options))
+        result = self._parse_tokens(cursor, s)
+        remaining = cursor.next()
+        if remaining.type != "EOF":
+            raise _token_error("Extra data", remaining)
+        return result
+
+    def raw_decode(self, s: str, idx: int = 0) -> Tuple[Any, int]:
+        if s is None or idx >= len(s):
+            raise ValueError("Empty string")
+        if self.max_bytes is not None:
+            self._check_size(s, idx)
+
+        if not idx:
+            cursor = _Cursor(tokenize(s, **self._tokenize_options))
+            return self._parse_tokens(cursor, s), cursor.last.end
+        # Token positions start at a placeholder line 1, column 1 so the call
+        # does not scan s[:idx]; only an error pays for the real position.
+        cursor = _Cursor(tokenize(s, start=idx, line=1, column=1, **self._tokenize_options))
+        try:
+            result = self._parse_tokens(cursor, s)
+        except TokenizeError as exc:
+            raise _relocate_error(exc, s) from None
+        return result, cursor.last.end
 
-        self.tokens = list(tokenize(s, strict=False))
-        self.pos = 0
+    def parse_tokens(self, tokens: Iterable[Token], source: Optional[str] = None) -> Any:
+        return self._parse_tokens(_Cursor(iter(tokens)), source)
 
-        def parse_value():
-            tok = self._peek()
+    def _parse_tokens(self, cursor: _Cursor, source: Optional[str]) -> Any:
+        tokens = cursor.tokens
+        limited = self.limited
+        nxt = self._limited_next(cursor) if limited else cursor.next
+        numeric_arrays = self.numeric_arrays
+        duplicate = _duplicate_handler(self.duplicate_keys)
+        if source is None or not hasattr(tokens, "send"):
+            numeric_arrays = None
+
+        def parse_value(tok):
             if tok.type == "{":
                 return parse_object()
             if tok.type == "[":
+                if numeric_arrays is not None:
+                    scanned = _scan_numeric_array(source, tok.end)
+                    if scanned is not None:
+                        return numeric_array(tok, *scanned)
                 return parse_array()
             if tok.type == "STRING":
-                self._next()
                 return tok.value
             if tok.type == "NUMBER":
-                self._next()
-                if "." in tok.value or "e" in tok.value or "E" in tok.value:
-                    return float(tok.value)
-                try:
-                    return int(tok.value)
-                except Exception:
-                    return float(tok.value)
+                return to_number(tok.value)
             if tok.type == "TRUE":
-                self._next()
                 return True
             if tok.type == "FALSE":
-                self._next()
                 return False
             if tok.type == "NULL":
-                self._next()
                 return None
-            raise TokenizeError("Unexpected token", tok.line, tok.column)
+            raise _token_error("Unexpected token", tok)
 
         def parse_object():
-            self._next()
             obj = {}
-            tok = self._peek()
-            if tok.type == "}":
-                self._next()
+            key_tok = nxt()
+            if key_tok.type == "}":
                 return obj
             while True:
-                key_tok = self._peek()
                 if key_tok.type != "STRING":
                     if key_tok.type in {":", "}", ",", "EOF", "INVALID"}:
-                        raise TokenizeError("Unexpected token", key_tok.line, key_tok.column)
-                    raise TokenizeError(
-                        "Expected string as object key", key_tok.line, key_tok.column
-                    )
-                self._next()
-                colon_tok = self._peek()
+                        raise _token_error("Unexpected token", key_tok)
+                    raise _token_error("Expected string as object key", key_tok)
+                colon_tok = nxt()
                 if colon_tok.type != ":":
-                    raise TokenizeError(
-                        "Expected ':' after object key", colon_tok.line, colon_tok.column
-                    )
-                self._next()
-                value = parse_value()
-                obj[key_tok.value] = value
-                sep = self._peek()
+                    raise _token_error("Expected ':' after object key", colon_tok)
+                key = key_tok.value
+                if duplicate is None or key not in obj:
+                    obj[key] = parse_value(nxt())
+                else:
+                    duplicate(obj, key, parse_value(nxt()), key_tok)
+                sep = nxt()
                 if sep.type == ",":
-                    self._next()
+                    key_tok = nxt()
                     continue
                 if sep.type == "}":
-                    self._next()
                     break
-                raise TokenizeError("Expected ',' or '}' in object", sep.line, sep.column)
+                raise _token_error("Expected ',' or '}' in object", sep)
             return obj
 
+        def numeric_array(open_tok, values, close):
+            # Resume the tokenizer on the ']' so the caller reads on after it.
+            cursor.last = tokens.send(close)
+            if limited:
+                nxt.bulk(len(values), open_tok)
+            if numeric_arrays == "numpy":
+                dtype = numpy.float64 if values.typecode == "d" else numpy.int64
+                return numpy.frombuffer(values, dtype=dtype)
+            return values
+
         def parse_array():
-            self._next()
             arr = []
-            tok = self._peek()
+            tok = nxt()
             if tok.type == "]":
-                self._next()
                 return arr
             while True:
-                arr.append(parse_value())
-                sep = self._peek()
+                arr.append(parse_value(tok))
+                sep = nxt()
                 if sep.type == ",":
-                    self._next()
+                    tok = nxt()
                     continue
                 if sep.type == "]":
-                    self._next()
                     break
-                raise TokenizeError("Expected ',' or ']' in array", sep.line, sep.column)
+                raise _token_error("Expected ',' or ']' in array", sep)
             return arr
 
-        result = parse_value()
-        if self.pos != len(self.tokens):
-            remaining = self._peek()
-            raise TokenizeError("Extra data", remaining.line, remaining.column)
-        return result
+        include = self.include
+        raw = self.raw
+        validate = self.validate
+        if validate is not None:
+            return self._parse_validated(nxt, parse_value, validate, duplicate)
+        if include is None and raw is None:
+            return parse_value(nxt())
+
+        can_seek = source is not None and hasattr(tokens, "send")
+
+        def skip(colon_tok):
+            # Returns the token that follows the skipped value.
+            if not can_seek:
+                _skip_tokens(nxt(), nxt)
+                return nxt()
+            end = skip_value(source, colon_tok.end)
+            try:
+                tok = tokens.send(end)
+            except StopIteration:
+                return _EOF
+            cursor.last = tok
+            if limited:
+                nxt.check(tok)
+            return tok
+
+        check_raw = self.check_raw
+
+        def keep_raw():
+            # Returns the value as a RawJSON slice and the token that follows it.
+            # A skimmed value is only bracket-balanced, not validated, and is not
+            # materialized, so it bypasses the limits; check_raw parses it fully.
+            tok = cursor.next() if can_seek and not check_raw else nxt()
+            if tok.type in {"}", "]", ",", ":", "EOF", "INVALID"}:
+                raise _token_error("Unexpected token", tok)
+            if not can_seek:
+                return RawJSON(JSONEncoder().encode(parse_value(tok))), nxt()
+            if check_raw:
+                start = tok.offset
+                parse_value(tok)
+                return RawJSON(source[start : cursor.last.end]), nxt()
+            end = skip_value(source, tok.offset)
+            text = RawJSON(source[tok.offset : end])
+            try:
+                tok = tokens.send(end)
+            except StopIteration:
+                return text, _EOF
+            cursor.last = tok
+            if limited:
+                nxt.check(tok)
+            return text, tok
+
+        def project_value(tok, spec):
+            if spec is None:
+                return parse_value(tok)
+            if tok.type == "{":
+                return project_object(spec)
+            if tok.type == "[":
+                return project_array(spec)
+            return parse_value(tok)
+
+        def project_object(spec):
+            obj = {}
+            key_tok = nxt()
+            if key_tok.type == "}":
+                return obj
+            while True:
+                if key_tok.type != "STRING":
+                    if key_tok.type in {":", "}", ",", "EOF", "INVALID"}:
+                        raise _token_error("Unexpected token", key_tok)
+                    raise _token_error("Expected string as object key", key_tok)
+                colon_tok = nxt()
+                if colon_tok.type != ":":
+                    raise _token_error("Expected ':' after object key", colon_tok)
+                key = key_tok.value
+                if key in spec:
+                    if duplicate is None or key not in obj:
+                        obj[key] = project_value(nxt(), spec[key])
+                    else:
+                        duplicate(obj, key, project_value(nxt(), spec[key]), key_tok)
+                    sep = nxt()
+                else:
+                    sep = skip(colon_tok)
+                if sep.type == ",":
+                    key_tok = nxt()
+                    continue
+                if sep.type == "}":
+                    break
+                raise _token_error("Expected ',' or '}' in object", sep)
+            return obj
+
+        def project_array(spec):
+            arr = []
+            tok = nxt()
+            if tok.type == "]":
+                return arr
+            while True:
+                arr.append(project_value(tok, spec))
+                sep = nxt()
+                if sep.type == ",":
+                    tok = nxt()
+                    continue
+                if sep.type == "]":
+                    break
+                raise _token_error("Expected ',' or ']' in array", sep)
+            return arr
+
+        def raw_value(tok, spec):
+            if tok.type == "{":
+                return raw_object(spec)
+            if tok.type == "[":
+                return raw_array(spec)
+            return parse_value(tok)
+
+        def raw_object(spec):
+            obj = {}
+            key_tok = nxt()
+            if key_tok.type == "}":
+                return obj
+            while True:
+                if key_tok.type != "STRING":
+                    if key_tok.type in {":", "}", ",", "EOF", "INVALID"}:
+                        raise _token_error("Unexpected token", key_tok)
+                    raise _token_error("Expected string as object key", key_tok)
+                colon_tok = nxt()
+                if colon_tok.type != ":":
+                    raise _token_error("Expected ':' after object key", colon_tok)
+                key = key_tok.value
+                if key not in spec:
+                    value = parse_value(nxt())
+                    sep = nxt()
+                elif spec[key] is None:
+                    value, sep = keep_raw()
+                else:
+                    value = raw_value(nxt(), spec[key])
+                    sep = nxt()
+                if duplicate is None or key not in obj:
+                    obj[key] = value
+                else:
+                    duplicate(obj, key, value, key_tok)
+                if sep.type == ",":
+                    key_tok = nxt()
+                    continue
+                if sep.type == "}":
+                    break
+                raise _token_error("Expected ',' or '}' in object", sep)
+            return obj
+
+        def raw_array(spec):
+            arr = []
+            tok = nxt()
+            if tok.type == "]":
+                return arr
+            while True:
+                arr.append(raw_value(tok, spec))
+                sep = nxt()
+                if sep.type == ",":
+                    tok = nxt()
+                    continue
+                if sep.type == "]":
+                    break
+                raise _token_error("Expected ',' or ']' in array", sep)
+            return arr
+
+        if raw is not None:
+            return raw_value(nxt(), raw)
+        return project_value(nxt(), include)
+
+    def _parse_validated(self, nxt, parse_value, schema, duplicate) -> Any:
+        path = []
+
+        def checked_value(tok, node):
+            if node is None:
+                return parse_value(tok)
+            node.check_type(tok, path)
+            if tok.type == "{":
+                value = checked_object(node)
+            elif tok.type == "[":
+                value = checked_array(node)
+            else:
+                value = parse_value(tok)
+                node.check_scalar(value, tok, path)
+                return value
+            node.check_enum(value, tok, path)
+            return value
+
+        def checked_object(node):
+            obj = {}
+            properties = node.properties
+            key_tok = nxt()
+            if key_tok.type == "}":
+                node.check_required(obj, key_tok, path)
+                return obj
+            while True:
+                if key_tok.type != "STRING":
+                    if key_tok.type in {":", "}", ",", "EOF", "INVALID"}:
+                        raise _token_error("Unexpected token", key_tok)
+                    raise _token_error("Expected string as object key", key_tok)
+                colon_tok = nxt()
+                if colon_tok.type != ":":
+                    raise _token_error("Expected ':' after object key", colon_tok)
+                key = key_tok.value
+                path.append(key)
+                if duplicate is None or key not in obj:
+                    obj[key] = checked_value(nxt(), properties.get(key))
+                else:
+                    duplicate(obj, key, checked_value(nxt(), properties.get(key)), key_tok)
+                path.pop()
+                sep = nxt()
+                if sep.type == ",":
+                    key_tok = nxt()
+                    continue
+                if sep.type == "}":
+                    node.check_required(obj, sep, path)
+                    return obj
+                raise _token_error("Expected ',' or '}' in object", sep)
+
+        def checked_array(node):
+            arr = []
+            items = node.items
+            tok = nxt()
+            if tok.type == "]":
+                return arr
+            while True:
+                node.check_items(len(arr), tok, path)
+                path.append(len(arr))
+                arr.append(checked_value(tok, items))
+                path.pop()
+                sep = nxt()
+                if sep.type == ",":
+                    tok = nxt()
+                    continue
+                if sep.type == "]":
+                    return arr
+                raise _token_error("Expected ',' or ']' in array", sep)
+
+        return checked_value(nxt(), schema)
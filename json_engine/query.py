@@ -0,0 +1,315 @@
+import itertools
+import operator
+import re
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from .parser import JSONDecoder, _token_error
+from .tokenizer import Token, TokenizeError, skip_value, tokenize
+
+Step = Tuple[Any, ...]
+
+_NAME_RE = re.compile(r"[A-Za-z_$][\w$-]*")
+_BRACKET_RE = re.compile(
+    r"\[\s*(?:"
+    r"(?P<star>\*)"
+    r"|'(?P<sq>[^']*)'"
+    r"|\"(?P<dq>[^\"]*)\""
+    r"|(?P<slice>-?\d*\s*:\s*-?\d*(?:\s*:\s*-?\d*)?)"
+    r"|(?P<index>-?\d+)"
+    r"|\?\(\s*@(?P<path>(?:\.[A-Za-z_$][\w$-]*|\['[^']*'\]|\[\"[^\"]*\"\])*)\s*"
+    r"(?:(?P<op>==|!=|<=|>=|<|>)\s*(?P<literal>'[^']*'|\"(?:[^\"\\\\]|\\\\.)*\"|[^)\s]+)\s*)?\)"
+    r")\s*\]"
+)
+_FILTER_KEY_RE = re.compile(r"\.([A-Za-z_$][\w$-]*)|\['([^']*)'\]|\[\"([^\"]*)\"\]")
+
+_OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def _parse_literal(text: str) -> Any:
+    if text.startswith("'"):
+        return text[1:-1]
+    try:
+        return JSONDecoder().decode(text)
+    except (TokenizeError, ValueError):
+        raise ValueError(f"Invalid filter literal {text!r}") from None
+
+
+def _make_predicate(
+    keys: Tuple[str, ...], op: Optional[str], literal: Any
+) -> Callable[[Any], bool]:
+    compare = _OPERATORS[op] if op else None
+
+    def predicate(value: Any) -> bool:
+        for key in keys:
+            if not isinstance(value, dict) or key not in value:
+                return False
+            value = value[key]
+        if compare is None:
+            return True
+        if isinstance(value, bool) != isinstance(literal, bool):
+            return op == "!="
+        try:
+            return bool(compare(value, literal))
+        except TypeError:
+            return False
+
+    return predicate
+
+
+def _compile_steps(expr: str) -> List[Step]:
+    expr = expr.strip()
+    if not expr.startswith("$"):
+        raise ValueError(f"Path must start with '$': {expr!r}")
+    steps: List[Step] = []
+    pos = 1
+    while pos < len(expr):
+        ch = expr[pos]
+        if ch == ".":
+            if expr.startswith(".*", pos):
+                steps.append(("wild",))
+                pos += 2
+                continue
+            m = _NAME_RE.match(expr, pos + 1)
+            if not m:
+                raise ValueError(f"Invalid path expression {expr!r} at position {pos}")
+            steps.append(("key", m.group(0)))
+            pos = m.end()
+            continue
+        if ch == "[":
+            m = _BRACKET_RE.match(expr, pos)
+            if not m:
+                raise ValueError(f"Invalid path expression {expr!r} at position {pos}")
+            pos = m.end()
+            if m.group("star"):
+                steps.append(("wild",))
+            elif m.group("sq") is not None or m.group("dq") is not None:
+                name = m.group("sq") if m.group("sq") is not None else m.group("dq")
+                steps.append(("key", name))
+            elif m.group("slice") is not None:
+                parts = [p.strip() for p in m.group("slice").split(":")]
+                start, stop, step = ([int(p) if p else None for p in parts] + [None])[:3]
+                if step == 0:
+                    raise ValueError(f"Slice step cannot be zero in {expr!r}")
+                steps.append(("slice", slice(start, stop, step)))
+            elif m.group("index") is not None:
+                steps.append(("index", int(m.group("index"))))
+            else:
+                keys = tuple(a or b or c for a, b, c in _FILTER_KEY_RE.findall(m.group("path")))
+                op = m.group("op")
+                literal = _parse_literal(m.group("literal")) if op else None
+                steps.append(("filter", _make_predicate(keys, op, literal)))
+            continue
+        raise ValueError(f"Invalid path expression {expr!r} at position {pos}")
+    return steps
+
+
+def _needs_length(step: Step) -> bool:
+    if step[0] == "index":
+        return step[1] < 0
+    if step[0] == "slice":
+        sl = step[1]
+        return any(v is not None and v < 0 for v in (sl.start, sl.stop, sl.step))
+    return False
+
+
+class JSONPath:
+    def __init__(self, expr: str):
+        self.expr = expr
+        self.steps = _compile_steps(expr)
+        self._decoder = JSONDecoder()
+
+    def __repr__(self):
+        return f"JSONPath({self.expr!r})"
+
+    def find(self, data: Any) -> List[Any]:
+        out: List[Any] = []
+        self._match_data(data, 0, out)
+        return out
+
+    def search(self, s: str) -> List[Any]:
+        if s is None or s == "":
+            raise ValueError("Empty string")
+        return self._find(tokenize(s, strict=False), s)
+
+    def find_tokens(self, tokens: Iterable[Token]) -> List[Any]:
+        return self._find(iter(tokens), None)
+
+    def _find(self, it: Iterator[Token], source: Optional[str]) -> List[Any]:
+        pending: List[Token] = []
+
+        def nxt() -> Token:
+            if pending:
+                return pending.pop()
+            tok = next(it, None)
+            if tok is None:
+                return Token("EOF", "", -1, -1)
+            return tok
+
+        def skip(tok: Token) -> None:
+            # tok is either the first token of the value or the ':' before it.
+            if source is None:
+                _skip(nxt() if tok.type == ":" else tok, nxt)
+                return
+            if tok.type == ":":
+                start = tok.end
+            elif tok.type == "{" or tok.type == "[":
+                start = tok.offset
+            else:
+                return
+            # Skim the raw text and resume the tokenizer after the value.
+            try:
+                pending.append(it.send(skip_value(source, start)))  # type: ignore
+            except StopIteration:
+                pending.append(Token("EOF", "", -1, -1))
+
+        out: List[Any] = []
+        self._match_tokens(nxt(), nxt, skip, it, 0, out)
+        tok = nxt()
+        if tok.type != "EOF":
+            raise _token_error("Extra data", tok)
+        return out
+
+    def _match_data(self, value: Any, i: int, out: List[Any]) -> None:
+        if i == len(self.steps):
+            out.append(value)
+            return
+        step = self.steps[i]
+        kind = step[0]
+        if kind == "key":
+            if isinstance(value, dict) and step[1] in value:
+                self._match_data(value[step[1]], i + 1, out)
+            return
+        if kind == "wild" or kind == "filter":
+            if isinstance(value, dict):
+                children: Iterable[Any] = value.values()
+            elif isinstance(value, list):
+                children = value
+            else:
+                return
+            for child in children:
+                if kind == "wild" or step[1](child):
+                    self._match_data(child, i + 1, out)
+            return
+        if not isinstance(value, list):
+            return
+        if kind == "index":
+            if -len(value) <= step[1] < len(value):
+                self._match_data(value[step[1]], i + 1, out)
+            return
+        for child in value[step[1]]:
+            self._match_data(child, i + 1, out)
+
+    def _build(self, tok: Token, it: Iterator[Token]) -> Any:
+        return self._decoder.parse_tokens(itertools.chain((tok,), it))
+
+    def _match_tokens(
+        self,
+        tok: Token,
+        nxt: Callable[[], Token],
+        skip: Callable[[Token], None],
+        it: Iterator[Token],
+        i: int,
+        out: List[Any],
+    ) -> None:
+        if i == len(self.steps):
+            out.append(self._build(tok, it))
+            return
+        step = self.steps[i]
+        kind = step[0]
+        if tok.type == "{":
+            if kind not in ("key", "wild", "filter"):
+                skip(tok)
+                return
+            key_tok = nxt()
+            if key_tok.type == "}":
+                return
+            while True:
+                if key_tok.type != "STRING":
+                    raise _token_error("Expected string as object key", key_tok)
+                colon_tok = nxt()
+                if colon_tok.type != ":":
+                    raise _token_error("Expected ':' after object key", colon_tok)
+                if kind == "key" and key_tok.value != step[1]:
+                    skip(colon_tok)
+                elif kind == "filter":
+                    value = self._build(nxt(), it)
+                    if step[1](value):
+                        self._match_data(value, i + 1, out)
+                else:
+                    self._match_tokens(nxt(), nxt, skip, it, i + 1, out)
+                sep = nxt()
+                if sep.type == ",":
+                    key_tok = nxt()
+                    continue
+                if sep.type == "}":
+                    return
+                raise _token_error("Expected ',' or '}' in object", sep)
+        if tok.type == "[":
+            if kind == "key":
+                skip(tok)
+                return
+            if _needs_length(step):
+                self._match_data(self._build(tok, it), i, out)
+                return
+            index = 0
+            value_tok = nxt()
+            if value_tok.type == "]":
+                return
+            while True:
+                if kind == "filter":
+                    value = self._build(value_tok, it)
+                    if step[1](value):
+                        self._match_data(value, i + 1, out)
+                elif kind == "wild" or _index_matches(step, index):
+                    self._match_tokens(value_tok, nxt, skip, it, i + 1, out)
+                else:
+                    skip(value_tok)
+                index += 1
+                sep = nxt()
+                if sep.type == ",":
+                    value_tok = nxt()
+                    continue
+                if sep.type == "]":
+                    return
+                raise _token_error("Expected ',' or ']' in array", sep)
+        if tok.type in ("}", "]", ",", ":", "EOF", "INVALID"):
+            raise _token_error("Unexpected token", tok)
+
+
+def _index_matches(step: Step, index: int) -> bool:
+    if step[0] == "index":
+        return index == step[1]
+    sl = step[1]
+    start = sl.start or 0
+    step_size = sl.step or 1
+    if index < start or (sl.stop is not None and index >= sl.stop):
+        return False
+    return (index - start) % step_size == 0
+
+
+def _skip(tok: Token, nxt: Callable[[], Token]) -> None:
+    if tok.type not in ("{", "["):
+        if tok.type in ("}", "]", ",", ":", "EOF", "INVALID"):
+            raise _token_error("Unexpected token", tok)
+        return
+    depth = 1
+    while depth:
+        t = nxt()
+        ttype = t.type
+        if ttype == "{" or ttype == "[":
+            depth += 1
+        elif ttype == "}" or ttype == "]":
+            depth -= 1
+        elif ttype == "EOF":
+            raise _token_error("Unexpected token", t)
+
+
+def compile_path(expr: str) -> JSONPath:
+    return JSONPath(expr)
@@ -0,0 +1,333 @@
+import dataclasses
+import re
+import typing
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+from .encoder import JSONEncoder, _encode_str, _float_repr
+from .parser import JSONDecoder
+
+_WS = r"[ \t\r\n]*"
+_INT = r"-?(?:0|[1-9]\d*)"
+_FLOAT = r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?"
+_STR = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_NoneType = type(None)
+_decoder = JSONDecoder()
+
+
+def _decode_str(text: str) -> str:
+    if "\\" not in text:
+        return text[1:-1]
+    return _decoder.decode(text)
+
+
+def _mismatch(expected: str, value: Any) -> ValueError:
+    return ValueError(f"Expected {expected}, got {type(value).__name__}")
+
+
+class _Node:
+    # Every node provides:
+    # - pattern: matches the JSON text of one value, with no capturing groups.
+    # - convert(text): turns that text into the target value.
+    # - build(value): adapts a value that the generic decoder already produced
+    #   on the fallback path. It validates types the way the fast path does:
+    #   ints are widened to float where a float is expected, and any other
+    #   mismatch raises ValueError.
+    pattern = ""
+
+
+class _Scalar(_Node):
+    def __init__(self, pattern: str, convert: Callable[[str], Any], build: Callable[[Any], Any]):
+        self.pattern = pattern
+        self.convert = convert
+        self.build = build
+
+
+class _Optional(_Node):
+    def __init__(self, node: _Node):
+        self.node = node
+        self.pattern = f"(?:null|{node.pattern})"
+
+    def convert(self, text: str) -> Any:
+        return None if text == "null" else self.node.convert(text)
+
+    def build(self, value: Any) -> Any:
+        return None if value is None else self.node.build(value)
+
+
+class _List(_Node):
+    def __init__(self, item: _Node):
+        self.item = item
+        self.pattern = rf"\[{_WS}(?:{item.pattern}(?:{_WS},{_WS}{item.pattern})*)?{_WS}\]"
+        self._item_re = re.compile(rf"{_WS}({item.pattern}){_WS}[,\]]")
+
+    def convert(self, text: str) -> List[Any]:
+        items = []
+        convert = self.item.convert
+        match = self._item_re.match
+        pos = 1
+        end = len(text)
+        while pos < end:
+            m = match(text, pos)
+            if m is None:
+                break
+            items.append(convert(m.group(1)))
+            pos = m.end()
+        return items
+
+    def build(self, value: Any) -> Any:
+        if type(value) is not list:
+            raise _mismatch("array", value)
+        return [self.item.build(v) for v in value]
+
+
+class _Object(_Node):
+    def __init__(self, fields: List[Tuple[str, _Node]], target: Optional[type]):
+        self.fields = fields
+        self.target = target
+        self.names = [name for name, _ in fields]
+        keys = [f"{re.escape(_encode_str(name))}{_WS}:{_WS}" for name in self.names]
+        sep = f"{_WS},{_WS}"
+        captured = sep.join(f"{key}({node.pattern})" for key, (_, node) in zip(keys, fields))
+        self._re = re.compile(rf"\{{{_WS}{captured}{_WS}\}}")
+        # Parents embed the non-capturing form and hand the matched text back
+        # to convert(), which re-matches it with the capturing regex.
+        plain = sep.join(f"{key}{node.pattern}" for key, (_, node) in zip(keys, fields))
+        self.pattern = rf"\{{{_WS}{plain}{_WS}\}}"
+        # Fields declared with kw_only cannot be passed positionally.
+        self._positional = target is not None and not any(
+            getattr(f, "kw_only", False) is True for f in dataclasses.fields(target)
+        )
+
+    def convert(self, text: str) -> Any:
+        m = self._re.fullmatch(text)
+        values = [node.convert(m.group(i)) for i, (_, node) in enumerate(self.fields, 1)]
+        return self._make(values)
+
+    def _make(self, values: List[Any]) -> Any:
+        if self.target is None:
+            return dict(zip(self.names, values))
+        if self._positional:
+            return self.target(*values)
+        return self.target(**dict(zip(self.names, values)))
+
+    def build(self, value: Any) -> Any:
+        # Extra keys are kept for dict schemas and dropped for dataclasses.
+        if type(value) is not dict:
+            raise _mismatch("object", value)
+        if self.target is None:
+            result = dict(value)
+            for name, node in self.fields:
+                if name not in result:
+                    raise ValueError(f"Missing key {name!r}")
+                result[name] = node.build(result[name])
+            return result
+        try:
+            return self.target(
+                **{name: node.build(value[name]) for name, node in self.fields if name in value}
+            )
+        except TypeError as exc:
+            raise ValueError(f"Input does not match schema for {self.target.__name__}") from exc
+
+
+def _exact(cls: type, expected: str) -> Callable[[Any], Any]:
+    def build(value: Any) -> Any:
+        if type(value) is not cls:
+            raise _mismatch(expected, value)
+        return value
+
+    return build
+
+
+def _build_float(value: Any) -> float:
+    if type(value) is float:
+        return value
+    if type(value) is int:
+        return float(value)
+    raise _mismatch("number", value)
+
+
+_SCALARS = {
+    int: _Scalar(_INT, int, _exact(int, "integer")),
+    float: _Scalar(_FLOAT, float, _build_float),
+    str: _Scalar(_STR, _decode_str, _exact(str, "string")),
+    bool: _Scalar("(?:true|false)", "true".__eq__, _exact(bool, "boolean")),
+    _NoneType: _Scalar("null", lambda text: None, _exact(_NoneType, "null")),
+}
+
+
+def _describe(schema: Any) -> Tuple[Any, ...]:
+    if schema is None:
+        schema = _NoneType
+    if isinstance(schema, type) and schema in _SCALARS:
+        return ("scalar", schema)
+    if isinstance(schema, dict):
+        return ("object", list(schema.items()), None)
+    if isinstance(schema, list) and len(schema) == 1:
+        return ("list", schema[0])
+    if isinstance(schema, type) and dataclasses.is_dataclass(schema):
+        hints = typing.get_type_hints(schema)
+        fields = [(f.name, hints[f.name]) for f in dataclasses.fields(schema)]
+        return ("object", fields, schema)
+    origin = typing.get_origin(schema)
+    args = typing.get_args(schema)
+    if origin in (list, List) and len(args) == 1:
+        return ("list", args[0])
+    if origin is typing.Union and len(args) == 2 and _NoneType in args:
+        return ("optional", args[0] if args[1] is _NoneType else args[1])
+    raise TypeError(f"Unsupported schema type: {schema!r}")
+
+
+def _compile(schema: Any) -> _Node:
+    kind, *spec = _describe(schema)
+    if kind == "scalar":
+        return _SCALARS[spec[0]]
+    if kind == "object":
+        fields, target = spec
+        if target is not None:
+            # Fields with init=False are set by the class itself, not by input.
+            init = {f.name for f in dataclasses.fields(target) if f.init}
+            fields = [(name, sub) for name, sub in fields if name in init]
+        return _Object([(name, _compile(sub)) for name, sub in fields], target)
+    if kind == "list":
+        return _List(_compile(spec[0]))
+    return _Optional(_compile(spec[0]))
+
+
+def _compile_encoder(schema: Any, encoder: JSONEncoder) -> Callable[[Any], str]:
+    # Every generated function checks the exact type it was compiled for and
+    # hands anything else to the generic encoder.
+    kind, *spec = _describe(schema)
+    generic = encoder.encode
+    if kind == "optional":
+        inner = _compile_encoder(spec[0], encoder)
+
+        def encode_optional(value: Any) -> str:
+            return "null" if value is None else inner(value)
+
+        return encode_optional
+    if kind == "list":
+        item = _compile_encoder(spec[0], encoder)
+        item_sep = encoder.item_separator
+
+        def encode_list(value: Any) -> str:
+            if type(value) is not list:
+                return generic(value)
+            return "[" + item_sep.join(map(item, value)) + "]"
+
+        return encode_list
+    if kind == "object":
+        fields, target = spec
+        if encoder.sort_keys:
+            fields = sorted(fields)
+        plan = [
+            (name, encoder._escape(name) + encoder.key_separator, _compile_encoder(sub, encoder))
+            for name, sub in fields
+        ]
+        item_sep = encoder.item_separator
+        size = len(plan)
+
+        if target is None:
+
+            def encode_dict(value: Any) -> str:
+                if type(value) is not dict or len(value) != size:
+                    return generic(value)
+                try:
+                    parts = [key + enc(value[name]) for name, key, enc in plan]
+                except KeyError:
+                    return generic(value)
+                return "{" + item_sep.join(parts) + "}"
+
+            return encode_dict
+
+        def encode_object(value: Any) -> str:
+            if type(value) is not target:
+                return generic(value)
+            parts = [key + enc(getattr(value, name)) for name, key, enc in plan]
+            return "{" + item_sep.join(parts) + "}"
+
+        return encode_object
+
+    scalar = spec[0]
+    if scalar is int:
+
+        def encode_int(value: Any) -> str:
+            return int.__repr__(value) if type(value) is int else generic(value)
+
+        return encode_int
+    if scalar is float:
+
+        def encode_float(value: Any) -> str:
+            # value - value is 0.0 only for finite floats.
+            if type(value) is float and value - value == 0.0:
+                return _float_repr(value)
+            return generic(value)
+
+        return encode_float
+    if scalar is str:
+        escape = encoder._escape
+
+        def encode_str(value: Any) -> str:
+            return escape(value) if type(value) is str else generic(value)
+
+        return encode_str
+    if scalar is bool:
+
+        def encode_bool(value: Any) -> str:
+            if value is True:
+                return "true"
+            if value is False:
+                return "false"
+            return generic(value)
+
+        return encode_bool
+    return generic
+
+
+class SchemaDecoder:
+    def __init__(self, schema: Any):
+        self.schema = schema
+        self._root = _compile(schema)
+        self._re = re.compile(rf"{_WS}({self._root.pattern}){_WS}")
+        self._decoder = JSONDecoder()
+        self.fallbacks = 0
+
+    def decode(self, s: str) -> Any:
+        if s is None or s == "":
+            raise ValueError("Empty string")
+        m = self._re.fullmatch(s)
+        if m is not None:
+            return self._root.convert(m.group(1))
+        # Key order, escapes or types differ from the schema: take the generic
+        # path, which also reports syntax errors with their position.
+        self.fallbacks += 1
+        return self._root.build(self._decoder.decode(s))
+
+
+def compile_decoder(schema: Any) -> SchemaDecoder:
+    return SchemaDecoder(schema)
+
+
+class SchemaEncoder:
+    def __init__(
+        self,
+        schema: Any,
+        separators: Optional[Tuple[str, str]] = None,
+        sort_keys: bool = False,
+        ensure_ascii: bool = False,
+        allow_nan: Union[bool, str] = "raise",
+    ):
+        self.schema = schema
+        self._encoder = JSONEncoder(
+            separators=separators,
+            sort_keys=sort_keys,
+            ensure_ascii=ensure_ascii,
+            allow_nan=allow_nan,
+        )
+        self.encode = _compile_encoder(schema, self._encoder)
+
+    def encode_bytes(self, obj: Any) -> bytes:
+        return self.encode(obj).encode("utf-8")
+
+
+def compile_encoder(schema: Any, **options: Any) -> SchemaEncoder:
+    return SchemaEncoder(schema, **options)
@@ -0,0 +1,72 @@
+import re
+from typing import Any, Iterator, Optional, TextIO, Tuple
+
+from .ndjson import BLOCK_SIZE
+from .parser import JSONDecoder
+from .tokenizer import TokenizeError
+
+_WHITESPACE_RE = re.compile(r"[ \t\r\n]*")
+# Text after a number that may still be part of it once more input arrives.
+_NUMBER_TAIL_RE = re.compile(r"[-+.eE0-9]*")
+
+
+def _is_truncation(exc: TokenizeError) -> bool:
+    return exc.line == -1 or exc.msg.startswith("Unterminated")
+
+
+def _stream_error(exc: TokenizeError, line: int, column: int, offset: int) -> TokenizeError:
+    # exc is positioned in the buffer, which starts at (line, column, offset).
+    if exc.line == -1:
+        return exc
+    col = exc.column + column - 1 if exc.line == 1 else exc.column
+    return type(exc)(exc.msg, line + exc.line - 1, col, offset + exc.offset)
+
+
+def iter_values(fp: TextIO, *, block_size: int = BLOCK_SIZE, trace: bool = False) -> Iterator[Any]:
+    decoder = JSONDecoder(trace=trace)
+    buf = ""
+    pos = 0
+    eof = False
+    read_size = block_size
+    last_error: Optional[Tuple[str, int, int]] = None
+    line, column, offset = 1, 1, 0
+
+    while True:
+        pos = _WHITESPACE_RE.match(buf, pos).end()
+        if pos < len(buf):
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except TokenizeError as exc:
+                if eof:
+                    raise _stream_error(exc, line, column, offset) from None
+                # The value may only be cut off by the block boundary; give it
+                # more input unless the same error shows up again.
+                error = (exc.msg, exc.line, exc.column)
+                if not _is_truncation(exc) and pos == 0 and error == last_error:
+                    raise _stream_error(exc, line, column, offset) from None
+                last_error = error if pos == 0 else None
+            else:
+                # A number next to the end of the buffer may continue in the
+                # next block ("1" of "12", "1." of "1.5").
+                if eof or not buf[end - 1].isdigit() or not _NUMBER_TAIL_RE.fullmatch(buf, end):
+                    yield value
+                    pos = end
+                    read_size = block_size
+                    last_error = None
+                    continue
+        elif eof:
+            return
+
+        chunk = fp.read(read_size)
+        if not chunk:
+            eof = True
+        newlines = buf.count("\n", 0, pos)
+        if newlines:
+            line += newlines
+            column = pos - buf.rfind("\n", 0, pos)
+        else:
+            column += pos
+        offset += pos
+        buf = buf[pos:] + chunk
+        pos = 0
+        read_size *= 2
@@ -1,33 +1,126 @@
 import re
-from typing import Generator
+from typing import Any, Dict, Generator, Optional, Tuple
+
+_NUMBER_RE = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?")
+_KEYWORDS = {"true": "TRUE", "false": "FALSE", "null": "NULL"}
+_NAN_KEYWORDS = {**_KEYWORDS, "NaN": "NUMBER", "Infinity": "NUMBER"}
+_SKIM_RE = re.compile(r'[{}\[\]]|"[^"\\]*(?:\\.[^"\\]*)*"|"')
+_SCALAR_RE = re.compile(r"[^\s,:\]}]+")
+_WHITESPACE_RE = re.compile(r"[ \t\r\n]*")
+_PLAIN_STRING_RE = re.compile(r'"([^"\\]*)"')
+_STRING_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"')
 
 
 class Token:
-    def __init__(self, type_: str, value: str, line: int, column: int):
+    def __init__(
+        self, type_: str, value: str, line: int, column: int, offset: int = -1, end: int = -1
+    ):
         self.type = type_
         self.value = value
         self.line = line
         self.column = column
+        self.offset = offset
+        self.end = end
 
     def __repr__(self):
         return f"Token({self.type!r}, {self.value!r}, line={self.line}, col={self.column})"
 
 
+def _restore_error(cls: type, args: Tuple[Any, ...], state: Dict[str, Any]) -> Exception:
+    exc = cls.__new__(cls)
+    exc.args = args
+    exc.__dict__.update(state)
+    return exc
+
+
 class TokenizeError(Exception):
-    def __init__(self, message: str, line: int, column: int):
+    def __init__(self, message: str, line: int, column: int, offset: int = -1):
         super().__init__(f"{message} at line {line}, column {column}")
+        self.msg = message
         self.line = line
         self.column = column
+        self.offset = offset
 
+    def __reduce__(self):
+        # The default would call __init__ with the formatted message alone, so
+        # errors could not cross process boundaries (see ndjson workers).
+        return _restore_error, (type(self), self.args, self.__dict__)
+
+
+class LimitError(TokenizeError):
+    pass
+
+
+def _position_error(message: str, json_string: str, offset: int) -> TokenizeError:
+    line = json_string.count("\n", 0, offset) + 1
+    col = offset - json_string.rfind("\n", 0, offset)
+    return TokenizeError(message, line, col, offset)
+
+
+def _moved_error(exc: TokenizeError, line: int, column: int, offset: int) -> TokenizeError:
+    # A copy of exc (same type and extra fields) reported at another position.
+    args = (f"{exc.msg} at line {line}, column {column}",)
+    state = dict(exc.__dict__, line=line, column=column, offset=offset)
+    return _restore_error(type(exc), args, state)
+
+
+def _relocate_error(exc: TokenizeError, json_string: str) -> TokenizeError:
+    # For errors from tokenize(..., line=1, column=1) started past offset 0:
+    # the offset is exact, line and column are recomputed from it.
+    if exc.offset < 0:
+        return exc
+    line = json_string.count("\n", 0, exc.offset) + 1
+    column = exc.offset - json_string.rfind("\n", 0, exc.offset)
+    return _moved_error(exc, line, column, exc.offset)
+
+
+def skip_value(json_string: str, start: int) -> int:
+    i = _WHITESPACE_RE.match(json_string, start).end()
+    if i >= len(json_string):
+        raise TokenizeError("Unexpected token", -1, -1)
+    ch = json_string[i]
+    if ch != "{" and ch != "[":
+        m = _SKIM_RE.match(json_string, i) if ch == '"' else _SCALAR_RE.match(json_string, i)
+        if not m or m.group(0) == '"':
+            message = "Unterminated string" if ch == '"' else "Unexpected token"
+            raise _position_error(message, json_string, i)
+        return m.end()
+
+    # Only brackets are balanced; strings are jumped over without decoding.
+    depth = 0
+    for m in _SKIM_RE.finditer(json_string, i):
+        c = m.group(0)
+        if c == "{" or c == "[":
+            depth += 1
+        elif c == "}" or c == "]":
+            depth -= 1
+            if not depth:
+                return m.end()
+        elif c == '"':
+            raise _position_error("Unterminated string", json_string, m.start())
+    raise TokenizeError("Unexpected token", -1, -1)
 
-def tokenize(json_string: str, *, strict: bool = True) -> Generator[Token, None, None]:
-    i = 0
-    line = 1
-    col = 1
-    length = len(json_string)
 
-    number_regex = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?")
-    keywords = {"true": "TRUE", "false": "FALSE", "null": "NULL"}
+def tokenize(
+    json_string: str,
+    *,
+    strict: bool = True,
+    start: int = 0,
+    allow_nan: bool = False,
+    max_string_length: Optional[int] = None,
+    line: Optional[int] = None,
+    column: Optional[int] = None,
+) -> Generator[Token, Optional[int], None]:
+    # Counting the lines before start costs O(start); callers that walk a
+    # large buffer pass line and column (possibly placeholders) instead.
+    i = start
+    if line is None:
+        line = json_string.count("\n", 0, start) + 1
+    col = start - json_string.rfind("\n", 0, start) if column is None else column
+    length = len(json_string)
+    number_match = _NUMBER_RE.match
+    keywords = _NAN_KEYWORDS if allow_nan else _KEYWORDS
+    plain_string_match = _PLAIN_STRING_RE.match
 
     while i < length:
         ch = json_string[i]
@@ -43,13 +136,30 @@ def tokenize(json_string: str, *, strict: bool = True) -> Generator[Token, None,
             continue
 
         if ch in "{}[]:,":
-            yield Token(ch, ch, line, col)
+            tok = Token(ch, ch, line, col, i, i + 1)
             i += 1
             col += 1
-            continue
 
-        if ch == '"':
+        elif ch == '"' and (m := plain_string_match(json_string, i)) is not None:
+            # Strings without escapes are sliced out in one step.
+            end = m.end()
+            if max_string_length is not None and end - i - 2 > max_string_length:
+                raise LimitError(f"String longer than {max_string_length} characters", line, col, i)
+            tok = Token("STRING", m.group(1), line, col, i, end)
+            col += end - i
+            i = end
+
+        elif ch == '"':
             start_col = col
+            start_i = i
+            if max_string_length is not None:
+                # An escape sequence is at most 6 characters long, so the raw
+                # length bounds the decoded one without decoding it.
+                m = _STRING_RE.match(json_string, i)
+                if m and m.end() - i - 2 > 6 * max_string_length:
+                    raise LimitError(
+                        f"String longer than {max_string_length} characters", line, col, i
+                    )
             i += 1
             col += 1
             value_chars = []
@@ -63,7 +173,7 @@ def tokenize(json_string: str, *, strict: bool = True) -> Generator[Token, None,
                     i += 1
                     col += 1
                     if i >= length:
-                        raise TokenizeError("Unterminated escape sequence", line, col)
+                        raise TokenizeError("Unterminated escape sequence", line, col, i)
                     esc = json_string[i]
                     if esc == "n":
                         value_chars.append("\n")
@@ -82,7 +192,7 @@ def tokenize(json_string: str, *, strict: bool = True) -> Generator[Token, None,
                         if len(hex_seq) < 4 or not all(
                             c in "0123456789abcdefABCDEF" for c in hex_seq
                         ):
-                            raise TokenizeError("Invalid unicode escape", line, col)
+                            raise TokenizeError("Invalid unicode escape", line, col, i)
                         value_chars.append(chr(int(hex_seq, 16)))
                         i += 4
                         col += 4
@@ -96,48 +206,67 @@ def tokenize(json_string: str, *, strict: bool = True) -> Generator[Token, None,
                     i += 1
                     col += 1
             else:
-                raise TokenizeError("Unterminated string", line, start_col)
-            yield Token("STRING", "".join(value_chars), line, start_col)
-            continue
+                raise TokenizeError("Unterminated string", line, start_col, start_i)
+            if max_string_length is not None and len(value_chars) > max_string_length:
+                raise LimitError(
+                    f"String longer than {max_string_length} characters",
+                    line,
+                    start_col,
+                    start_i,
+                )
+            tok = Token("STRING", "".join(value_chars), line, start_col, start_i, i)
 
-        if ch == "-" or ch.isdigit():
-            start_col = col
-            m = number_regex.match(json_string[i:])
-            if not m:
+        elif ch == "-" or ch.isdigit():
+            m = number_match(json_string, i)
+            if not m and allow_nan and json_string.startswith("-Infinity", i):
+                tok = Token("NUMBER", "-Infinity", line, col, i, i + 9)
+                i += 9
+                col += 9
+            elif not m:
                 if strict:
-                    raise TokenizeError("Invalid number", line, col)
-                yield Token("INVALID", ch, line, col)
+                    raise TokenizeError("Invalid number", line, col, i)
+                tok = Token("INVALID", ch, line, col, i, i + 1)
                 i += 1
                 col += 1
-                continue
-            num_str = m.group(0)
-            next_index = i + len(num_str)
-            if (
-                (num_str == "0" or num_str == "-0")
-                and next_index < length
-                and json_string[next_index].isdigit()
-            ):
-                raise TokenizeError("Invalid number", line, col)
-            yield Token("NUMBER", num_str, line, start_col)
-            i += len(num_str)
-            col += len(num_str)
-            continue
+            else:
+                num_str = m.group(0)
+                next_index = i + len(num_str)
+                if (
+                    (num_str == "0" or num_str == "-0")
+                    and next_index < length
+                    and json_string[next_index].isdigit()
+                ):
+                    raise TokenizeError("Invalid number", line, col, i)
+                tok = Token("NUMBER", num_str, line, col, i, next_index)
+                i = next_index
+                col += len(num_str)
 
-        matched_kw = None
-        for kw, ttype in keywords.items():
-            if json_string.startswith(kw, i):
-                matched_kw = (kw, ttype)
-                break
-        if matched_kw:
-            kw, ttype = matched_kw
-            start_col = col
-            yield Token(ttype, kw, line, start_col)
-            i += len(kw)
-            col += len(kw)
-            continue
+        else:
+            matched_kw = None
+            for kw, ttype in keywords.items():
+                if json_string.startswith(kw, i):
+                    matched_kw = (kw, ttype)
+                    break
+            if matched_kw:
+                kw, ttype = matched_kw
+                tok = Token(ttype, kw, line, col, i, i + len(kw))
+                i += len(kw)
+                col += len(kw)
+            else:
+                if strict:
+                    raise TokenizeError(f"Unexpected character {ch!r}", line, col, i)
+                tok = Token("INVALID", ch, line, col, i, i + 1)
+                i += 1
+                col += 1
 
-        if strict:
-            raise TokenizeError(f"Unexpected character {ch!r}", line, col)
-        yield Token("INVALID", ch, line, col)
-        i += 1
-        col += 1
+        # A consumer may send() an offset to resume scanning there, e.g. after
+        # skimming over a value it does not need (see skip_value).
+        jump = yield tok
+        if jump is not None:
+            newlines = json_string.count("\n", i, jump)
+            if newlines:
+                line += newlines
+                col = jump - json_string.rfind("\n", i, jump)
+            else:
+                col += jump - i
+            i = jump
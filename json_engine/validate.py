@@ -0,0 +1,117 @@
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from .tokenizer import Token, TokenizeError
+
+_TYPES = frozenset(("object", "array", "string", "number", "integer", "boolean", "null"))
+
+_TOKEN_TYPES = {
+    "{": "object",
+    "[": "array",
+    "STRING": "string",
+    "NUMBER": "number",
+    "TRUE": "boolean",
+    "FALSE": "boolean",
+    "NULL": "null",
+}
+
+
+def _format_path(path: List[Any]) -> str:
+    return "$" + "".join(f"[{p}]" if isinstance(p, int) else f".{p}" for p in path)
+
+
+class ValidationError(TokenizeError):
+    def __init__(self, message: str, line: int, column: int, offset: int = -1, path: str = "$"):
+        super().__init__(f"{message} at {path}", line, column, offset)
+        self.path = path
+
+
+class CompiledSchema:
+    __slots__ = (
+        "types",
+        "enum",
+        "minimum",
+        "maximum",
+        "max_length",
+        "max_items",
+        "required",
+        "properties",
+        "items",
+    )
+
+    def __init__(self, schema: Dict[str, Any]):
+        if not isinstance(schema, dict):
+            raise TypeError("Schema must be a dict")
+        types = schema.get("type")
+        if isinstance(types, str):
+            types = [types]
+        if types is not None and not set(types) <= _TYPES:
+            raise ValueError(f"Unsupported schema type {schema['type']!r}")
+        self.types: Optional[FrozenSet[str]] = frozenset(types) if types is not None else None
+        self.enum: Optional[List[Any]] = schema.get("enum")
+        self.minimum = schema.get("minimum")
+        self.maximum = schema.get("maximum")
+        self.max_length: Optional[int] = schema.get("maxLength")
+        self.max_items: Optional[int] = schema.get("maxItems")
+        self.required: List[str] = list(schema.get("required", ()))
+        self.properties: Dict[str, CompiledSchema] = {
+            name: compile_schema(sub) for name, sub in schema.get("properties", {}).items()
+        }
+        items = schema.get("items")
+        self.items: Optional[CompiledSchema] = compile_schema(items) if items is not None else None
+
+    def check_type(self, tok: Token, path: List[Any]) -> None:
+        # "integer" needs the number's value and is checked in check_scalar.
+        types = self.types
+        if types is None:
+            return
+        kind = _TOKEN_TYPES.get(tok.type)
+        # Tokens that cannot start a value are left to the parser's syntax error.
+        if kind is None or kind in types or (kind == "number" and "integer" in types):
+            return
+        expected = " or ".join(sorted(types))
+        raise _error(f"Expected {expected}", tok, path)
+
+    def check_scalar(self, value: Any, tok: Token, path: List[Any]) -> None:
+        types = self.types
+        if tok.type == "NUMBER":
+            if types is not None and "number" not in types and not _is_integer(value):
+                raise _error("Expected integer", tok, path)
+            if self.minimum is not None and value < self.minimum:
+                raise _error(f"Value {value!r} is less than minimum {self.minimum!r}", tok, path)
+            if self.maximum is not None and value > self.maximum:
+                raise _error(f"Value {value!r} is greater than maximum {self.maximum!r}", tok, path)
+        elif tok.type == "STRING":
+            if self.max_length is not None and len(value) > self.max_length:
+                raise _error(f"String is longer than maxLength {self.max_length}", tok, path)
+        self.check_enum(value, tok, path)
+
+    def check_required(self, obj: Dict[str, Any], tok: Token, path: List[Any]) -> None:
+        for name in self.required:
+            if name not in obj:
+                raise _error(f"Missing required property {name!r}", tok, path)
+
+    def check_items(self, count: int, tok: Token, path: List[Any]) -> None:
+        if self.max_items is not None and count >= self.max_items:
+            raise _error(f"Array has more than {self.max_items} items", tok, path)
+
+    def check_enum(self, value: Any, tok: Token, path: List[Any]) -> None:
+        if self.enum is None:
+            return
+        for allowed in self.enum:
+            if allowed == value and isinstance(allowed, bool) == isinstance(value, bool):
+                return
+        raise _error(f"Value {value!r} is not one of {self.enum!r}", tok, path)
+
+
+def _is_integer(value: Any) -> bool:
+    return isinstance(value, int) or value.is_integer()
+
+
+def _error(message: str, tok: Token, path: List[Any]) -> ValidationError:
+    return ValidationError(message, tok.line, tok.column, tok.offset, _format_path(path))
+
+
+def compile_schema(schema: Any) -> CompiledSchema:
+    if isinstance(schema, CompiledSchema):
+        return schema
+    return CompiledSchema(schema)
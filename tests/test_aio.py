@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from json_engine.aio import adump, aiter_items, aload
+from json_engine.api import loads
+from json_engine.tokenizer import TokenizeError
+
+
+def _reader(data: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+class TestAload:
+    """Testy asynchronicznego load()"""
+
+    def test_aload_object(self):
+        async def run():
+            return await aload(_reader(b'{"a": [1, 2, {"b": null}], "c": "d"}'), chunk_size=4)
+
+        assert asyncio.run(run()) == {"a": [1, 2, {"b": None}], "c": "d"}
+
+    def test_aload_utf8_split_across_chunks(self):
+        async def run():
+            return await aload(_reader('{"pl": "Zażółć gęślą jaźń"}'.encode()), chunk_size=1)
+
+        assert asyncio.run(run()) == {"pl": "Zażółć gęślą jaźń"}
+
+    def test_aload_invalid_body(self):
+        async def run():
+            return await aload(_reader(b'{"a": }'))
+
+        with pytest.raises(TokenizeError):
+            asyncio.run(run())
+
+    def test_aload_overlaps_reads(self):
+        async def run():
+            reader = asyncio.StreamReader()
+
+            async def producer():
+                for part in (b'{"items": [', b"1, 2, ", b"3]}"):
+                    await asyncio.sleep(0)
+                    reader.feed_data(part)
+                reader.feed_eof()
+
+            task = asyncio.ensure_future(producer())
+            result = await aload(reader)
+            await task
+            return result
+
+        assert asyncio.run(run()) == {"items": [1, 2, 3]}
+
+
+class TestAiterItems:
+    """Testy asynchronicznego iterowania po elementach"""
+
+    def test_items_streamed(self):
+        body = b'{"users": [' + b", ".join(b'{"id": %d}' % i for i in range(100)) + b"]}"
+
+        async def run():
+            return [item async for item in aiter_items(_reader(body), "users.item", chunk_size=16)]
+
+        assert asyncio.run(run()) == [{"id": i} for i in range(100)]
+
+    def test_items_yielded_before_body_ends(self):
+        async def run():
+            reader = asyncio.StreamReader()
+            reader.feed_data(b'[{"a": 1}, {"a": 2}, ')
+            items = aiter_items(reader, "item")
+            first = await items.__anext__()
+            second = await items.__anext__()
+            reader.feed_data(b'{"a": 3}]')
+            reader.feed_eof()
+            rest = [item async for item in items]
+            return [first, second] + rest
+
+        assert asyncio.run(run()) == [{"a": 1}, {"a": 2}, {"a": 3}]
+
+
+class _Writer:
+    def __init__(self):
+        self.chunks = []
+        self.drains = 0
+
+    def write(self, data):
+        self.chunks.append(data)
+
+    async def drain(self):
+        self.drains += 1
+
+
+class TestAdump:
+    """Testy asynchronicznego dump()"""
+
+    def test_writes_utf8_json(self):
+        writer = _Writer()
+        asyncio.run(adump({"pl": "jaźń", "n": [1, 2]}, writer))
+        assert b"".join(writer.chunks) == '{"pl": "jaźń", "n": [1, 2]}'.encode()
+        assert writer.drains == 1
+
+    def test_nan_policy(self):
+        writer = _Writer()
+        asyncio.run(adump([float("inf")], writer, allow_nan=True))
+        assert b"".join(writer.chunks) == b"[Infinity]"
+
+    def test_chunked_with_drain_between_chunks(self):
+        writer = _Writer()
+        data = [{"id": i, "name": f"user {i}"} for i in range(200)]
+        asyncio.run(adump(data, writer, chunk_size=256))
+        assert len(writer.chunks) > 10
+        assert writer.drains == len(writer.chunks)
+        assert all(len(chunk) < 512 for chunk in writer.chunks)
+        assert loads(b"".join(writer.chunks).decode()) == data
+
+    def test_yields_to_event_loop(self):
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0)
+
+        async def run():
+            task = asyncio.ensure_future(ticker())
+            await adump([f"v{i}" for i in range(1000)], _Writer(), yield_every=100)
+            task.cancel()
+
+        asyncio.run(run())
+        assert len(ticks) >= 5
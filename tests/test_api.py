@@ -1,9 +1,12 @@
+import io
 import os
 import tempfile
 
 import pytest
 
-from json_engine.api import JSONError, dump, dumps, load, loads
+from json_engine.api import JSONError, dump, dumpb, dumps, load, loads
+from json_engine.encoder import EncodeCache
+from json_engine.tokenizer import LimitError
 
 
 class TestLoadsFunction:
@@ -39,6 +42,10 @@ class TestLoadsFunction:
         result = loads('{"test": 123}', trace=True)
         assert result == {"test": 123}
 
+    def test_loads_with_include(self):
+        result = loads('{"a": {"b": 1, "c": [2, 3]}, "d": 4}', include={"a": {"c"}})
+        assert result == {"a": {"c": [2, 3]}}
+
 
 class TestDumpsFunction:
     """Testy funkcji dumps()"""
@@ -373,3 +380,172 @@ class TestAPIConsistency:
         result1 = dumps(data)
         result2 = dumps(data)
         assert result1 == result2
+
+
+class TestDumpsCache:
+    """Testy dumps() z cache enkodera"""
+
+    def test_dumps_with_cache(self):
+        cache = EncodeCache()
+        shared = cache.mark({"enum": ["x", "y"]})
+        assert dumps({"a": shared}, cache=cache) == '{"a": {"enum": ["x", "y"]}}'
+        assert dumps({"b": shared}, cache=cache) == '{"b": {"enum": ["x", "y"]}}'
+        assert cache.hits == 1
+
+
+class TestRawProxying:
+    """Testy przekazywania fragmentów JSON bez dekodowania"""
+
+    def test_loads_raw_then_dumps(self):
+        upstream = '{"status": "ok", "data": {"rows": [[1, 2], [3, 4]]}}'
+        decoded = loads(upstream, raw={"data"})
+        assert dumps({"proxied": decoded["data"]}) == '{"proxied": {"rows": [[1, 2], [3, 4]]}}'
+
+    def test_raw_cannot_be_lazy(self):
+        with pytest.raises(ValueError):
+            loads("{}", lazy=True, raw={"a"})
+
+
+class TestDumpsFormatting:
+    """Testy formatowania w dumps() i dump()"""
+
+    def test_dumps_compact(self):
+        assert dumps({"a": [1, 2]}, separators=(",", ":")) == '{"a":[1,2]}'
+
+    def test_dump_indent_sorted(self, tmp_path):
+        path = tmp_path / "out.json"
+        with open(path, "w") as fp:
+            dump({"b": 1, "a": 2}, fp, indent=2, sort_keys=True)
+        assert path.read_text() == '{\n  "a": 2,\n  "b": 1\n}'
+
+
+class TestBytesOutput:
+    """Testy wyjścia UTF-8 jako bytes"""
+
+    DATA = {"name": "Zażółć", "emoji": "\U0001f600", "n": [1, 2]}
+
+    def test_dumpb_returns_utf8(self):
+        out = dumpb(self.DATA)
+        assert isinstance(out, bytes)
+        assert out == dumps(self.DATA).encode("utf-8")
+        assert loads(out.decode("utf-8")) == self.DATA
+
+    def test_dumpb_ensure_ascii(self):
+        out = dumpb(self.DATA, ensure_ascii=True)
+        assert out.isascii()
+        assert b'"Za\\u017c\\u00f3\\u0142\\u0107"' in out
+        assert b'"\\ud83d\\ude00"' in out
+
+    def test_dump_to_binary_file(self, tmp_path):
+        path = tmp_path / "out.json"
+        with open(path, "wb") as fp:
+            dump(self.DATA, fp, separators=(",", ":"))
+        assert path.read_bytes() == dumpb(self.DATA, separators=(",", ":"))
+
+    def test_dump_to_bytesio_in_blocks(self):
+        data = [{"id": i, "text": "ą" * 50} for i in range(3000)]
+        buf = io.BytesIO()
+        dump(data, buf)
+        assert buf.getvalue() == dumps(data).encode("utf-8")
+
+    def test_dump_to_text_file_unchanged(self):
+        buf = io.StringIO()
+        dump(self.DATA, buf, ensure_ascii=True)
+        assert buf.getvalue() == dumps(self.DATA, ensure_ascii=True)
+
+
+class TestNonFiniteRoundTrip:
+    """Testy NaN/Infinity przez dumps() i loads()"""
+
+    def test_literal_round_trip(self):
+        text = dumps([float("inf"), 0.5], allow_nan="literal")
+        assert text == "[Infinity, 0.5]"
+        assert loads(text, allow_nan=True) == [float("inf"), 0.5]
+
+    def test_bool_round_trip(self):
+        text = dumps([float("-inf")], allow_nan=True)
+        assert loads(text, allow_nan=True) == [float("-inf")]
+        with pytest.raises(ValueError):
+            dumps([float("nan")], allow_nan=False)
+
+    def test_allow_nan_cannot_be_lazy(self):
+        with pytest.raises(ValueError):
+            loads("[NaN]", lazy=True, allow_nan=True)
+
+    def test_dumpb_null_policy(self):
+        assert dumpb({"v": float("nan")}, allow_nan="null") == b'{"v": null}'
+
+
+class TestNumericArraysOption:
+    """Testy loads() z numeric_arrays"""
+
+    def test_loads_numeric_arrays(self):
+        result = loads('{"series": [0.5, 1.5]}', numeric_arrays="array")
+        assert result["series"].typecode == "d"
+        assert list(result["series"]) == [0.5, 1.5]
+
+    def test_numeric_arrays_cannot_be_lazy(self):
+        with pytest.raises(ValueError):
+            loads("[1, 2]", lazy=True, numeric_arrays="array")
+
+
+class TestLoadsLimits:
+    """Testy limitów w loads()"""
+
+    def test_loads_with_limits(self):
+        with pytest.raises(LimitError):
+            loads("[[[]]]", max_depth=2)
+        assert loads("[[]]", max_depth=2) == [[]]
+
+    def test_load_reads_at_most_the_limit(self):
+        class CountingIO(io.StringIO):
+            sizes = []
+
+            def read(self, size=-1):
+                CountingIO.sizes.append(size)
+                return super().read(size)
+
+        fp = CountingIO("[" + "1, " * 100_000 + "1]")
+        with pytest.raises(LimitError):
+            load(fp, max_bytes=64)
+        assert CountingIO.sizes == [65]
+        assert fp.tell() == 65
+
+    def test_limits_cannot_be_lazy(self):
+        with pytest.raises(ValueError):
+            loads("[]", lazy=True, max_bytes=10)
+
+
+class TestLoadsDuplicateKeys:
+    """Testy duplicate_keys w loads()"""
+
+    def test_loads_rejects_duplicates(self):
+        with pytest.raises(JSONError):
+            loads('{"a": 1, "a": 2}', duplicate_keys="error")
+        assert loads('{"a": 1, "a": 2}', duplicate_keys="first") == {"a": 1}
+
+    def test_duplicate_policy_cannot_be_lazy(self):
+        with pytest.raises(ValueError):
+            loads("{}", lazy=True, duplicate_keys="error")
+
+
+class TestDefaultInstances:
+    """Testy współdzielonych instancji dla domyślnych opcji"""
+
+    def test_default_options_reuse_instances(self, monkeypatch):
+        from json_engine import api
+
+        def fail(*args, **kwargs):
+            raise AssertionError("unexpected construction")
+
+        monkeypatch.setattr(api, "JSONDecoder", fail)
+        monkeypatch.setattr(api, "JSONEncoder", fail)
+        assert loads('{"a": [1, 2]}') == {"a": [1, 2]}
+        assert dumps({"a": [1, 2]}) == '{"a": [1, 2]}'
+        assert dumpb([1]) == b"[1]"
+
+    def test_custom_options_get_own_instance(self):
+        assert loads('{"a": 1, "a": 2}', duplicate_keys="first") == {"a": 1}
+        assert loads('{"a": 1, "a": 2}') == {"a": 2}
+        assert dumps({"b": 1, "a": 2}, sort_keys=True) == '{"a": 2, "b": 1}'
+        assert dumps({"b": 1, "a": 2}) == '{"b": 1, "a": 2}'
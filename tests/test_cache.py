@@ -0,0 +1,139 @@
+import copy
+import pickle
+
+import pytest
+
+from json_engine.api import dumps
+from json_engine.cache import CachedDecoder, FrozenDict, FrozenList, fast_copy, freeze
+from json_engine.tokenizer import LimitError, TokenizeError
+
+
+class TestCachedDecoder:
+    """Testy cache zdekodowanych dokumentów"""
+
+    def test_hit_and_miss_counters(self):
+        cache = CachedDecoder()
+        doc = '{"a": [1, 2]}'
+        assert cache.decode(doc) == {"a": [1, 2]}
+        assert cache.decode(doc) == {"a": [1, 2]}
+        assert cache.decode('{"b": 1}') == {"b": 1}
+        assert (cache.hits, cache.misses, cache.evictions) == (1, 2, 0)
+        assert cache.stats()["entries"] == 2
+
+    def test_frozen_mode_returns_shared_read_only_value(self):
+        cache = CachedDecoder(mode="frozen")
+        first = cache.decode('{"a": [1, {"b": 2}]}')
+        second = cache.decode('{"a": [1, {"b": 2}]}')
+        assert first is second
+        assert isinstance(first, FrozenDict) and isinstance(first, dict)
+        with pytest.raises(TypeError):
+            first["c"] = 1
+        with pytest.raises(TypeError):
+            first["a"].append(3)
+        with pytest.raises(TypeError):
+            first["a"][1]["b"] = 3
+
+    def test_frozen_values_still_encode(self):
+        cache = CachedDecoder()
+        value = cache.decode('{"a": [1, 2]}')
+        assert dumps(value) == '{"a": [1, 2]}'
+
+    def test_copy_mode_returns_independent_values(self):
+        cache = CachedDecoder(mode="copy")
+        first = cache.decode('{"a": [1]}')
+        first["a"].append(2)
+        second = cache.decode('{"a": [1]}')
+        assert second == {"a": [1]}
+        assert type(second) is dict
+        assert cache.hits == 1
+
+    def test_lru_eviction_by_entry_count(self):
+        cache = CachedDecoder(max_entries=2)
+        cache.decode("[1]")
+        cache.decode("[2]")
+        cache.decode("[1]")
+        cache.decode("[3]")
+        assert cache.evictions == 1
+        cache.decode("[1]")
+        assert cache.hits == 2
+        cache.decode("[2]")
+        assert cache.misses == 4
+
+    def test_eviction_by_byte_size(self):
+        cache = CachedDecoder(max_cache_bytes=20)
+        cache.decode('"' + "a" * 8 + '"')
+        cache.decode('"' + "b" * 8 + '"')
+        assert cache.evictions == 0
+        cache.decode('"' + "c" * 8 + '"')
+        assert cache.evictions == 1
+        assert cache.current_bytes <= 20
+
+    def test_oversized_documents_are_not_cached(self):
+        cache = CachedDecoder(max_cache_bytes=4)
+        cache.decode("[1, 2, 3]")
+        assert len(cache) == 0
+
+    def test_decoder_options_and_errors(self):
+        cache = CachedDecoder(include={"a"})
+        assert cache.decode('{"a": 1, "b": 2}') == {"a": 1}
+        with pytest.raises(TokenizeError):
+            cache.decode("[1,,]")
+        assert len(cache) == 1
+
+    def test_hash_collision_is_not_a_hit(self):
+        class Colliding(str):
+            def __hash__(self):
+                return 42
+
+        cache = CachedDecoder()
+        assert cache.decode(Colliding("[1]")) == [1]
+        assert cache.decode(Colliding("[2]")) == [2]
+        assert cache.hits == 0
+        assert cache.decode(Colliding("[1]")) == [1]
+        assert cache.hits == 1
+
+    def test_decoder_limits_pass_through(self):
+        cache = CachedDecoder(max_bytes=8)
+        assert cache.decode("[1, 2]") == [1, 2]
+        with pytest.raises(LimitError):
+            cache.decode("[1, 2, 3, 4]")
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            CachedDecoder(mode="shared")
+
+    def test_clear(self):
+        cache = CachedDecoder()
+        cache.decode("[1]")
+        cache.clear()
+        assert len(cache) == 0 and cache.current_bytes == 0
+
+
+class TestFreezeAndCopy:
+    """Testy pomocniczych funkcji freeze/fast_copy"""
+
+    def test_freeze_is_deep(self):
+        frozen = freeze({"a": [{"b": []}]})
+        assert isinstance(frozen["a"], FrozenList)
+        assert isinstance(frozen["a"][0], FrozenDict)
+
+    def test_fast_copy_is_deep(self):
+        original = {"a": [{"b": [1]}]}
+        copied = fast_copy(original)
+        copied["a"][0]["b"].append(2)
+        assert original == {"a": [{"b": [1]}]}
+
+    @pytest.mark.parametrize(
+        "roundtrip",
+        [copy.copy, copy.deepcopy, lambda value: pickle.loads(pickle.dumps(value))],
+    )
+    def test_frozen_values_copy_and_pickle(self, roundtrip):
+        frozen = freeze({"a": [{"b": [1]}], "c": "x"})
+        copied = roundtrip(frozen)
+        assert copied == frozen
+        assert type(copied) is FrozenDict
+        assert type(copied["a"]) is FrozenList and type(copied["a"][0]) is FrozenDict
+        with pytest.raises(TypeError):
+            copied["d"] = 1
+        with pytest.raises(TypeError):
+            copied["a"].append(2)
@@ -1,6 +1,10 @@
+from array import array
+from dataclasses import dataclass, field
+from typing import List
+
 import pytest
 
-from json_engine.encoder import JSONEncoder
+from json_engine.encoder import EncodeCache, JSONEncoder, RawJSON
 
 
 class TestBasicEncoding:
@@ -306,3 +310,300 @@ class TestConsistency:
         assert zero_result == "0"
         assert false_result == "false"
         assert zero_result != false_result
+
+
+class TestIterencode:
+    """Testy kodowania kawałkami (iterencode)"""
+
+    def test_chunks_join_to_encode(self):
+        encoder = JSONEncoder()
+        data = {"a": [1, {"b": None}, []], "c": {}, "d": "x\ny", "e": [True, 2.5]}
+        assert "".join(encoder.iterencode(data)) == encoder.encode(data)
+
+    def test_scalar_yields_single_chunk(self):
+        encoder = JSONEncoder()
+        assert list(encoder.iterencode(42)) == ["42"]
+
+    def test_is_lazy(self):
+        encoder = JSONEncoder()
+        chunks = encoder.iterencode([1, 2, object()])
+        assert next(chunks) == "[1"
+        with pytest.raises(TypeError):
+            list(chunks)
+
+
+class TestEncodeCache:
+    """Testy memoizacji niezmiennych poddrzew"""
+
+    def test_marked_subtree_is_encoded_once(self):
+        cache = EncodeCache()
+        table = cache.mark({"codes": ["A", "B", "C"]})
+        encoder = JSONEncoder(cache=cache)
+        first = encoder.encode({"ref": table, "n": 1})
+        second = encoder.encode([table, table])
+        assert first == '{"ref": {"codes": ["A", "B", "C"]}, "n": 1}'
+        assert second == '[{"codes": ["A", "B", "C"]}, {"codes": ["A", "B", "C"]}]'
+        assert cache.misses == 1
+        assert cache.hits == 2
+
+    def test_cached_text_is_spliced_without_walking(self):
+        cache = EncodeCache()
+        table = cache.mark([1, 2, 3])
+        encoder = JSONEncoder(cache=cache)
+        encoder.encode({"t": table})
+        table.append(4)
+        # Poddrzewo oznaczone jako niezmienne - bez invalidate() tekst zostaje
+        assert encoder.encode({"t": table}) == '{"t": [1, 2, 3]}'
+        cache.invalidate(table)
+        assert encoder.encode({"t": table}) == '{"t": [1, 2, 3, 4]}'
+
+    def test_marked_root(self):
+        cache = EncodeCache()
+        doc = cache.mark({"a": 1})
+        assert JSONEncoder(cache=cache).encode(doc) == '{"a": 1}'
+        assert "".join(JSONEncoder(cache=cache).iterencode(doc)) == '{"a": 1}'
+        assert cache.hits == 1
+
+    def test_lru_eviction_drops_marks(self):
+        cache = EncodeCache(max_entries=2)
+        a, b, c = cache.mark([1]), cache.mark([2]), cache.mark([3])
+        assert cache.evictions == 1
+        assert a not in cache
+        assert b in cache and c in cache
+        assert JSONEncoder(cache=cache).encode([a, b, c]) == "[[1], [2], [3]]"
+
+    def test_only_containers_can_be_marked(self):
+        with pytest.raises(TypeError):
+            EncodeCache().mark("text")
+
+    def test_unmarked_objects_are_not_cached(self):
+        cache = EncodeCache()
+        JSONEncoder(cache=cache).encode({"a": [1]})
+        assert len(cache) == 0
+        assert cache.misses == 0
+
+
+class TestRawJSON:
+    """Testy przepisywania RawJSON bez ponownego kodowania"""
+
+    def test_raw_is_written_verbatim(self):
+        encoder = JSONEncoder()
+        fragment = RawJSON('{"already": ["encoded"]}')
+        assert encoder.encode(fragment) == '{"already": ["encoded"]}'
+        assert encoder.encode([fragment, "x"]) == '[{"already": ["encoded"]}, "x"]'
+        assert encoder.encode({"k": fragment}) == '{"k": {"already": ["encoded"]}}'
+
+    def test_raw_is_still_a_string(self):
+        assert isinstance(RawJSON("1"), str)
+        assert JSONEncoder().encode("1") == '"1"'
+
+
+class TestFormattingOptions:
+    """Testy opcji indent, separators i sort_keys"""
+
+    DATA = {"b": [1, {"x": []}, {}], "a": {"k": "v"}}
+
+    def test_compact_separators(self):
+        encoder = JSONEncoder(separators=(",", ":"))
+        assert encoder.encode(self.DATA) == '{"b":[1,{"x":[]},{}],"a":{"k":"v"}}'
+
+    def test_sort_keys(self):
+        encoder = JSONEncoder(sort_keys=True)
+        assert encoder.encode({"b": 1, "a": {"d": 2, "c": 3}}) == (
+            '{"a": {"c": 3, "d": 2}, "b": 1}'
+        )
+
+    def test_indent(self):
+        encoder = JSONEncoder(indent=2, sort_keys=True)
+        assert encoder.encode(self.DATA) == (
+            '{\n  "a": {\n    "k": "v"\n  },\n  "b": [\n    1,\n'
+            '    {\n      "x": []\n    },\n    {}\n  ]\n}'
+        )
+
+    def test_indent_string_and_custom_separators(self):
+        encoder = JSONEncoder(indent="\t", separators=(", ", " = "))
+        assert encoder.encode({"a": [1, 2]}) == '{\n\t"a" = [\n\t\t1, \n\t\t2\n\t]\n}'
+
+    def test_indent_scalar_root(self):
+        assert JSONEncoder(indent=4).encode(5) == "5"
+
+    def test_sort_keys_rejects_non_string_keys(self):
+        with pytest.raises(TypeError):
+            JSONEncoder(sort_keys=True).encode({1: "a", "b": 2})
+
+    def test_cache_text_follows_separators(self):
+        cache = EncodeCache()
+        shared = cache.mark({"a": [1, 2]})
+        assert JSONEncoder(cache=cache).encode([shared]) == '[{"a": [1, 2]}]'
+        compact = JSONEncoder(cache=cache, separators=(",", ":"))
+        assert compact.encode([shared]) == '[{"a":[1,2]}]'
+        assert JSONEncoder(cache=cache, indent=1).encode(shared) == '{\n "a": [\n  1,\n  2\n ]\n}'
+
+
+class TestEnsureAscii:
+    """Testy trybu ensure_ascii"""
+
+    def test_default_keeps_non_ascii_raw(self):
+        assert JSONEncoder().encode("żółw") == '"żółw"'
+
+    def test_bmp_characters_are_escaped(self):
+        assert JSONEncoder(ensure_ascii=True).encode("żółw") == '"\\u017c\\u00f3\\u0142w"'
+
+    def test_astral_characters_use_surrogate_pairs(self):
+        assert JSONEncoder(ensure_ascii=True).encode("a\U0001f600") == '"a\\ud83d\\ude00"'
+
+    def test_keys_and_nested_values(self):
+        encoder = JSONEncoder(ensure_ascii=True)
+        assert encoder.encode({"klucz_ł": ["é", 1]}) == '{"klucz_\\u0142": ["\\u00e9", 1]}'
+
+    def test_specials_and_controls_still_escaped(self):
+        encoder = JSONEncoder(ensure_ascii=True)
+        assert encoder.encode("'\"\n\x01\x7f") == '"\\u0027\\"\\n\\u0001\x7f"'
+
+    def test_encode_bytes(self):
+        assert JSONEncoder().encode_bytes(["ą"]) == '["ą"]'.encode()
+
+    def test_mixed_escapes_in_long_string(self):
+        text = ('ascii "q" ' * 20) + "ę\t" + "\U0001f680" * 3
+        out = JSONEncoder(ensure_ascii=True).encode(text)
+        assert out.isascii()
+        assert out.count("\\ud83d\\ude80") == 3
+        assert "\\u0119\\t" in out
+        assert out.startswith('"ascii \\"q\\" ')
+
+    def test_ascii_only_string_matches_default(self):
+        text = "plain 'quoted' text\x1f"
+        assert JSONEncoder(ensure_ascii=True).encode(text) == JSONEncoder().encode(text)
+
+
+class TestFloatEncoding:
+    """Testy kodowania liczb zmiennoprzecinkowych i polityki NaN"""
+
+    def test_shortest_round_trip(self):
+        encoder = JSONEncoder()
+        for value in (0.1, 1.0, -0.0, 1e-7, 1.7976931348623157e308, 2.5e16, 1 / 3):
+            text = encoder.encode(value)
+            assert float(text) == value
+            assert text == repr(value)
+
+    def test_nan_raises_by_default(self):
+        with pytest.raises(ValueError):
+            JSONEncoder().encode([1.0, float("nan")])
+
+    def test_nan_as_null(self):
+        encoder = JSONEncoder(allow_nan="null")
+        assert encoder.encode({"a": float("inf"), "b": [float("nan")]}) == (
+            '{"a": null, "b": [null]}'
+        )
+
+    def test_nan_as_literals(self):
+        encoder = JSONEncoder(allow_nan="literal")
+        values = [float("nan"), float("inf"), float("-inf"), 1.5]
+        assert encoder.encode(values) == "[NaN, Infinity, -Infinity, 1.5]"
+
+    def test_bool_policy_matches_decoder_flag(self):
+        assert JSONEncoder(allow_nan=True).encode([float("inf")]) == "[Infinity]"
+        with pytest.raises(ValueError):
+            JSONEncoder(allow_nan=False).encode([float("inf")])
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            JSONEncoder(allow_nan="maybe")
+
+    def test_numeric_array_fast_path(self):
+        assert JSONEncoder().encode([1, 2.5, -3, 1e20]) == "[1, 2.5, -3, 1e+20]"
+        assert JSONEncoder(separators=(",", ":")).encode([[1, 2], [3.0]]) == "[[1,2],[3.0]]"
+        assert JSONEncoder(indent=1).encode([1, 2]) == "[\n 1,\n 2\n]"
+
+    def test_mixed_arrays_fall_back(self):
+        assert JSONEncoder().encode([1, True, None, "x"]) == '[1, true, null, "x"]'
+        assert JSONEncoder(allow_nan="null").encode([1.0, float("nan")]) == "[1.0, null]"
+
+
+class TestBufferEncoding:
+    """Testy kodowania array.array, memoryview i tablic NumPy"""
+
+    def test_array_array(self):
+        encoder = JSONEncoder()
+        assert encoder.encode(array("q", [1, -2, 3])) == "[1, -2, 3]"
+        assert encoder.encode({"d": array("d", [0.5, 2])}) == '{"d": [0.5, 2.0]}'
+        assert encoder.encode([array("b"), array("u", "ab")]) == '[[], ["a", "b"]]'
+
+    def test_memoryview_with_shape(self):
+        view = memoryview(array("i", [1, 2, 3, 4])).cast("B").cast("i", [2, 2])
+        assert JSONEncoder(separators=(",", ":")).encode(view) == "[[1,2],[3,4]]"
+
+    def test_indent_and_nan_policy_apply(self):
+        assert JSONEncoder(indent=1).encode({"a": array("q", [7])}) == '{\n "a": [\n  7\n ]\n}'
+        values = array("d", [float("inf"), 1.0])
+        assert JSONEncoder(allow_nan="null").encode(values) == "[null, 1.0]"
+        with pytest.raises(ValueError):
+            JSONEncoder().encode(values)
+
+    def test_numpy_arrays(self):
+        numpy = pytest.importorskip("numpy")
+        matrix = numpy.arange(6, dtype=numpy.int64).reshape(2, 3)
+        assert JSONEncoder().encode({"m": matrix}) == '{"m": [[0, 1, 2], [3, 4, 5]]}'
+        assert JSONEncoder().encode(numpy.float64(0.5)) == "0.5"
+
+
+@dataclass
+class _Point:
+    x: int
+    y: float
+    tags: List[str] = field(default_factory=list)
+
+
+class _Slotted:
+    __slots__ = ("name", "child", "_secret")
+
+    def __init__(self, name, child=None):
+        self.name = name
+        if child is not None:
+            self.child = child
+        self._secret = "hidden"
+
+
+class _SlottedChild(_Slotted):
+    __slots__ = "extra"
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.extra = True
+
+
+class TestDataclassEncoding:
+    """Testy kodowania dataclass i klas z __slots__"""
+
+    def test_dataclass_fields_in_declaration_order(self):
+        point = _Point(1, 2.5, ["a"])
+        assert JSONEncoder().encode(point) == '{"x": 1, "y": 2.5, "tags": ["a"]}'
+
+    def test_nested_objects(self):
+        obj = _Slotted("root", child=[_Point(0, 0.5)])
+        assert JSONEncoder(separators=(",", ":")).encode({"o": obj}) == (
+            '{"o":{"name":"root","child":[{"x":0,"y":0.5,"tags":[]}]}}'
+        )
+
+    def test_unset_and_private_slots_are_skipped(self):
+        assert JSONEncoder().encode(_Slotted("a")) == '{"name": "a"}'
+        assert JSONEncoder().encode(_SlottedChild("b")) == '{"name": "b", "extra": true}'
+
+    def test_sort_keys_and_indent(self):
+        encoder = JSONEncoder(indent=1, sort_keys=True)
+        assert encoder.encode([_Point(1, 2.0)]) == (
+            '[\n {\n  "tags": [],\n  "x": 1,\n  "y": 2.0\n }\n]'
+        )
+
+    def test_plans_are_cached_per_class(self):
+        encoder = JSONEncoder()
+        encoder.encode([_Point(1, 1.0), _Point(2, 2.0)])
+        assert list(encoder._plans) == [_Point]
+
+    def test_other_objects_still_rejected(self):
+        class Plain:
+            pass
+
+        for value in (object(), Plain(), 1j):
+            with pytest.raises(TypeError):
+                JSONEncoder().encode(value)
@@ -0,0 +1,120 @@
+import pytest
+
+from json_engine.incremental import IncrementalParser, ItemBuilder
+from json_engine.tokenizer import TokenizeError
+
+
+def _events(chunks):
+    parser = IncrementalParser()
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    events.extend(parser.close())
+    return events
+
+
+class TestIncrementalParser:
+    """Testy parsera przyrostowego (zdarzenia)"""
+
+    def test_event_stream(self):
+        assert _events(['{"a": [1, "x"], "b": {"c": null}}']) == [
+            ("", "start_map", None),
+            ("", "map_key", "a"),
+            ("a", "start_array", None),
+            ("a.item", "number", 1),
+            ("a.item", "string", "x"),
+            ("a", "end_array", None),
+            ("", "map_key", "b"),
+            ("b", "start_map", None),
+            ("b", "map_key", "c"),
+            ("b.c", "null", None),
+            ("b", "end_map", None),
+            ("", "end_map", None),
+        ]
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7])
+    def test_chunk_boundaries_do_not_change_events(self, size):
+        text = '{"num": -12.5e+3, "s": "a\\u0041\\"b", "flags": [true, false, null], "n": 10}'
+        chunks = [text[i : i + size] for i in range(0, len(text), size)]
+        assert _events(chunks) == _events([text])
+
+    def test_feed_returns_events_early(self):
+        parser = IncrementalParser()
+        assert parser.feed('[1, 2, "par') == [
+            ("", "start_array", None),
+            ("item", "number", 1),
+            ("item", "number", 2),
+        ]
+        assert parser.feed('tial"]') == [("item", "string", "partial"), ("", "end_array", None)]
+        assert parser.close() == []
+
+    def test_number_at_chunk_end_waits_for_more(self):
+        parser = IncrementalParser()
+        assert parser.feed("[12") == [("", "start_array", None)]
+        assert parser.feed("34]") == [("item", "number", 1234), ("", "end_array", None)]
+
+    def test_scalar_document(self):
+        assert _events(["4", "2"]) == [("", "number", 42)]
+
+    def test_truncated_document_raises(self):
+        parser = IncrementalParser()
+        parser.feed('{"a": [1, 2')
+        with pytest.raises(TokenizeError):
+            parser.close()
+
+    def test_syntax_error_raises_on_feed(self):
+        parser = IncrementalParser()
+        with pytest.raises(TokenizeError, match="Expected ',' or ']'"):
+            parser.feed("[1 2]")
+
+    def test_extra_data_raises(self):
+        parser = IncrementalParser()
+        with pytest.raises(TokenizeError, match="Extra data"):
+            parser.feed("[1] [2]")
+
+    def test_long_string_over_many_chunks(self):
+        text = "ab\\n\\\\" * 5000
+        doc = f'["{text}", 1]'
+        parser = IncrementalParser()
+        events = []
+        for i in range(0, len(doc), 7):
+            events.extend(parser.feed(doc[i : i + 7]))
+        events.extend(parser.close())
+        assert events[1] == ("item", "string", "ab\n\\" * 5000)
+        assert events[2] == ("item", "number", 1)
+
+    def test_error_position_is_relative_to_stream(self):
+        parser = IncrementalParser()
+        parser.feed('{"a": 1,\n "b": [1, 2,\n')
+        with pytest.raises(TokenizeError) as exc_info:
+            parser.feed(" 3,, 4]}")
+        assert (exc_info.value.line, exc_info.value.column, exc_info.value.offset) == (3, 4, 25)
+
+    def test_unterminated_string_position_on_close(self):
+        parser = IncrementalParser()
+        parser.feed('[1,\n "abc')
+        parser.feed("def")
+        with pytest.raises(TokenizeError, match="Unterminated string") as exc_info:
+            parser.close()
+        assert (exc_info.value.line, exc_info.value.column, exc_info.value.offset) == (2, 2, 5)
+
+
+class TestItemBuilder:
+    """Testy budowania obiektów ze zdarzeń"""
+
+    def test_items_under_prefix(self):
+        builder = ItemBuilder("users.item")
+        events = _events(['{"users": [{"id": 1, "tags": ["a"]}, {"id": 2, "tags": []}], "n": 2}'])
+        assert builder.push(events) == [{"id": 1, "tags": ["a"]}, {"id": 2, "tags": []}]
+
+    def test_scalar_items(self):
+        builder = ItemBuilder("ids.item")
+        assert builder.push(_events(['{"ids": [3, 4, 5]}'])) == [3, 4, 5]
+
+    def test_state_survives_between_batches(self):
+        parser = IncrementalParser()
+        builder = ItemBuilder("item")
+        items = builder.push(parser.feed('[{"a": [1, '))
+        assert items == []
+        items = builder.push(parser.feed('2]}, {"b": 3}]'))
+        assert items == [{"a": [1, 2]}, {"b": 3}]
@@ -0,0 +1,115 @@
+import time
+
+import pytest
+
+from json_engine.api import dumps, loads
+from json_engine.index import IndexedNode, JSONIndex, build_index
+from json_engine.tokenizer import TokenizeError
+
+DOC = {
+    "users": [{"id": i, "name": f"User {i}", "tags": ["a", "b"]} for i in range(50)],
+    "config": {"debug": False, "path": "C:\\tmp", 'quote"key': 1},
+    "empty": [],
+}
+TEXT = dumps(DOC)
+
+
+class TestBuildIndex:
+    """Testy budowania taśmy strukturalnej"""
+
+    def test_tape_offsets_point_at_values(self):
+        index = build_index('{"a": [1, "x"], "b": null}')
+        assert isinstance(index, JSONIndex)
+        starts = [index.source[o] for o in index.offsets]
+        assert starts == ["{", '"', "[", "1", '"', "]", '"', "n", "}"]
+        assert index.offsets.typecode == "q"
+
+    def test_links_match_brackets(self):
+        index = build_index('{"a": [1, "x"]}')
+        assert index.links[0] == 6
+        assert index.links[6] == 0
+        assert index.links[2] == 5
+
+    @pytest.mark.parametrize("text", ['{"a": [1}', "[1, 2", '["abc', "[1] [2]", "  "])
+    def test_structural_errors(self, text):
+        with pytest.raises(TokenizeError):
+            build_index(text)
+
+    @pytest.mark.parametrize(
+        "text",
+        ["[1 2 3]", "[1: 2: 3]", '{"a" 1, "b" 2}', '{"a": 1 "b": 2}', '{"a": }', '{"a"}'],
+    )
+    def test_separators_are_checked(self, text):
+        with pytest.raises(TokenizeError):
+            build_index(text)
+
+    @pytest.mark.parametrize("text", ["[1,]", "[,1]", "[1,,2]", '{"a": 1,}', "{,}", "[1],", "]"])
+    def test_stray_separators(self, text):
+        with pytest.raises(TokenizeError):
+            build_index(text)
+
+    def test_empty_input(self):
+        with pytest.raises(ValueError):
+            build_index("")
+
+
+class TestIndexLookups:
+    """Testy dostępu swobodnego przez indeks"""
+
+    def test_nested_lookup(self):
+        index = build_index(TEXT)
+        assert index["users"][37]["name"] == "User 37"
+        assert index["users"][-1]["id"] == 49
+        assert index["config"]["path"] == "C:\\tmp"
+        assert index["config"]['quote"key'] == 1
+
+    def test_container_nodes(self):
+        index = build_index(TEXT)
+        users = index["users"]
+        assert isinstance(users, IndexedNode)
+        assert len(users) == 50
+        assert users[3].value() == DOC["users"][3]
+        assert list(index["config"]) == list(DOC["config"])
+        assert "debug" in index["config"]
+        assert len(index["empty"]) == 0
+
+    def test_scalar_root(self):
+        assert build_index(" 42 ").root == 42
+
+    def test_missing_keys(self):
+        index = build_index(TEXT)
+        with pytest.raises(KeyError):
+            index["nope"]
+        with pytest.raises(IndexError):
+            index["users"][100]
+        assert index["config"].get("nope", "d") == "d"
+
+    def test_wrong_key_types(self):
+        index = build_index(TEXT)
+        with pytest.raises(TypeError):
+            index[0]
+        with pytest.raises(TypeError):
+            index["users"]["0"]
+
+    def test_full_value_roundtrip(self):
+        assert build_index(TEXT).root.value() == loads(TEXT)
+
+    def test_only_addressed_value_is_validated(self):
+        index = build_index('{"bad": [01, tru], "good": 3}')
+        assert index["good"] == 3
+        with pytest.raises(TokenizeError):
+            index["bad"].value()
+
+    def test_lookups_do_not_rescan_the_source(self):
+        text = dumps(list(range(20000)))
+        root = build_index(text).root
+
+        def best(func):
+            timings = []
+            for _ in range(3):
+                started = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - started)
+            return min(timings)
+
+        assert best(lambda: list(root)) < best(lambda: loads(text)) * 12
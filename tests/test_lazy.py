@@ -0,0 +1,133 @@
+import time
+from collections.abc import Mapping, Sequence
+
+import pytest
+
+from json_engine.api import dumps, loads
+from json_engine.lazy import LazyArray, LazyObject, lazy_loads
+from json_engine.tokenizer import TokenizeError
+
+DOC = {
+    "id": 7,
+    "user": {"name": "Alice", "roles": ["admin", "user"], "bio": "a ] tricky } string"},
+    "items": [{"n": i} for i in range(20)],
+    "empty_obj": {},
+    "empty_arr": [],
+}
+TEXT = dumps(DOC)
+
+
+class TestLazyProxies:
+    """Testy leniwych dokumentów"""
+
+    def test_loads_lazy_returns_proxies(self):
+        doc = loads(TEXT, lazy=True)
+        assert isinstance(doc, LazyObject)
+        assert isinstance(doc, Mapping)
+        assert isinstance(doc["items"], LazyArray)
+        assert isinstance(doc["items"], Sequence)
+
+    def test_field_access(self):
+        doc = loads(TEXT, lazy=True)
+        assert doc["id"] == 7
+        assert doc["user"]["name"] == "Alice"
+        assert doc["user"]["roles"][1] == "user"
+        assert doc["items"][-1]["n"] == 19
+        assert doc["user"]["bio"] == "a ] tricky } string"
+
+    def test_children_are_cached(self):
+        doc = loads(TEXT, lazy=True)
+        assert doc["user"] is doc["user"]
+        assert doc["items"][3] is doc["items"][3]
+
+    def test_mapping_and_sequence_protocols(self):
+        doc = loads(TEXT, lazy=True)
+        assert list(doc) == list(DOC)
+        assert len(doc) == 5
+        assert "user" in doc and "nope" not in doc
+        assert len(doc["items"]) == 20
+        assert len(doc["empty_obj"]) == 0 and len(doc["empty_arr"]) == 0
+        assert doc["items"][1:3] == [{"n": 1}, {"n": 2}]
+        assert doc.get("nope") is None
+
+    def test_equality_with_plain_values(self):
+        doc = loads(TEXT, lazy=True)
+        assert doc == DOC
+        assert doc["items"] == DOC["items"]
+
+    def test_materialize(self):
+        doc = loads(TEXT, lazy=True)
+        assert doc.materialize() == DOC
+        assert type(doc["user"].materialize()) is dict
+
+    def test_read_only(self):
+        doc = loads(TEXT, lazy=True)
+        with pytest.raises(TypeError):
+            doc["id"] = 1
+        with pytest.raises(TypeError):
+            doc["items"][0] = 1
+
+    def test_missing_keys_and_indices(self):
+        doc = loads(TEXT, lazy=True)
+        with pytest.raises(KeyError):
+            doc["nope"]
+        with pytest.raises(IndexError):
+            doc["items"][20]
+
+    def test_iteration_is_not_much_slower_than_full_decode(self):
+        # Each child is scanned from its own offset, not from the start of the source.
+        text = dumps([{"n": i} for i in range(20000)])
+
+        def best(func):
+            timings = []
+            for _ in range(3):
+                started = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - started)
+            return min(timings)
+
+        full = best(lambda: loads(text))
+        lazy = best(lambda: [item["n"] for item in loads(text, lazy=True)])
+        assert lazy < full * 10
+
+    def test_untouched_proxies_encode_from_source(self):
+        text = '{"a" : [1,2],  "b": {"c": "\\u00e9"}}'
+        assert dumps(loads(text, lazy=True)) == text
+        assert dumps([loads("[1,  2]", lazy=True)]) == "[[1,  2]]"
+
+    def test_touched_proxies_are_walked(self):
+        doc = loads(TEXT, lazy=True)
+        assert doc["user"]["name"] == "Alice"
+        assert loads(dumps(doc)) == DOC
+        assert dumps(doc, sort_keys=True) == dumps(DOC, sort_keys=True)
+        assert dumps(loads(TEXT, lazy=True), indent=2) == dumps(DOC, indent=2)
+
+    def test_scalar_root(self):
+        assert lazy_loads(' "x" ') == "x"
+        assert lazy_loads("12") == 12
+
+
+class TestLazyErrors:
+    """Testy błędów w trybie leniwym"""
+
+    def test_empty_input(self):
+        with pytest.raises(ValueError):
+            loads("", lazy=True)
+
+    def test_extra_data(self):
+        with pytest.raises(TokenizeError, match="Extra data"):
+            loads('{"a": 1} 2', lazy=True)
+
+    def test_unbalanced_document(self):
+        with pytest.raises(TokenizeError):
+            loads('{"a": [1, 2}', lazy=True)
+
+    def test_errors_surface_on_access(self):
+        doc = loads('{"ok": 1, "bad": [1 2]}', lazy=True)
+        assert doc["ok"] == 1
+        with pytest.raises(TokenizeError):
+            doc["bad"][0]
+
+    def test_include_and_lazy_conflict(self):
+        with pytest.raises(ValueError):
+            loads("{}", lazy=True, include={"a"})
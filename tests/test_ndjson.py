@@ -0,0 +1,95 @@
+import io
+
+import pytest
+
+from json_engine.ndjson import _decode_lines, dump_ndjson, iter_ndjson
+from json_engine.parser import JSONDecoder
+from json_engine.tokenizer import LimitError, TokenizeError
+
+
+class TestIterNdjson:
+    """Testy czytania NDJSON"""
+
+    def test_reads_values_line_by_line(self):
+        fp = io.StringIO('{"a": 1}\n[1, 2]\n"text"\nnull\n')
+        assert list(iter_ndjson(fp)) == [{"a": 1}, [1, 2], "text", None]
+
+    def test_skips_blank_lines_and_crlf(self):
+        fp = io.StringIO('{"a": 1}\r\n\r\n\n{"b": 2}')
+        assert list(iter_ndjson(fp)) == [{"a": 1}, {"b": 2}]
+
+    def test_lines_split_across_blocks(self):
+        records = [{"id": i, "name": f"user {i}"} for i in range(50)]
+        text = "".join(f'{{"id": {r["id"]}, "name": "{r["name"]}"}}\n' for r in records)
+        assert list(iter_ndjson(io.StringIO(text), block_size=7)) == records
+
+    def test_error_reports_stream_line(self):
+        fp = io.StringIO('{"a": 1}\n\n{"b": }\n')
+        with pytest.raises(TokenizeError) as exc_info:
+            list(iter_ndjson(fp))
+        assert exc_info.value.line == 3
+        assert exc_info.value.offset == 16
+        assert "line 3, column 7" in str(exc_info.value)
+
+    def test_error_offset_counts_earlier_blocks(self):
+        fp = io.StringIO("[1]\r\n" * 10 + "[1,,2]\n")
+        with pytest.raises(TokenizeError) as exc_info:
+            list(iter_ndjson(fp, block_size=8))
+        assert (exc_info.value.line, exc_info.value.offset) == (11, 53)
+
+    def test_error_keeps_subclass(self):
+        with pytest.raises(LimitError) as exc_info:
+            _decode_lines(["[1]", "[[1]]"], 10, 100, JSONDecoder(max_depth=1))
+        assert (exc_info.value.line, exc_info.value.offset) == (11, 105)
+
+    def test_worker_errors_report_stream_line(self):
+        fp = io.StringIO("[1]\n" * 30 + "[1,,2]\n")
+        with pytest.raises(TokenizeError) as exc_info:
+            list(iter_ndjson(fp, workers=2, block_size=16))
+        assert (exc_info.value.line, exc_info.value.offset) == (31, 123)
+
+    def test_empty_stream(self):
+        assert list(iter_ndjson(io.StringIO(""))) == []
+
+    def test_worker_pool_preserves_order(self):
+        records = [{"id": i, "tags": ["x", "y"]} for i in range(200)]
+        buf = io.StringIO()
+        dump_ndjson(records, buf)
+        buf.seek(0)
+        assert list(iter_ndjson(buf, workers=2, block_size=64)) == records
+
+
+class TestDumpNdjson:
+    """Testy zapisu NDJSON"""
+
+    def test_writes_one_value_per_line(self):
+        buf = io.StringIO()
+        dump_ndjson([{"a": 1}, [1, 2], "x\ny"], buf)
+        assert buf.getvalue() == '{"a": 1}\n[1, 2]\n"x\\ny"\n'
+
+    def test_buffered_writes(self):
+        class CountingIO(io.StringIO):
+            writes = 0
+
+            def write(self, s):
+                CountingIO.writes += 1
+                return super().write(s)
+
+        buf = CountingIO()
+        dump_ndjson(({"id": i} for i in range(1000)), buf, block_size=4096)
+        assert CountingIO.writes < 10
+        assert buf.getvalue().count("\n") == 1000
+
+    def test_nan_policy(self):
+        buf = io.StringIO()
+        dump_ndjson([[float("nan")]], buf, allow_nan="null")
+        assert buf.getvalue() == "[null]\n"
+        with pytest.raises(ValueError):
+            dump_ndjson([[float("nan")]], io.StringIO())
+
+    def test_roundtrip(self):
+        records = [{"id": i, "ok": i % 2 == 0, "score": i * 0.5} for i in range(100)]
+        buf = io.StringIO()
+        dump_ndjson(records, buf)
+        buf.seek(0)
+        assert list(iter_ndjson(buf)) == records
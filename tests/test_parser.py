@@ -1,7 +1,11 @@
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
+from json_engine.encoder import JSONEncoder, RawJSON
 from json_engine.parser import JSONDecoder
-from json_engine.tokenizer import TokenizeError
+from json_engine.tokenizer import LimitError, TokenizeError, tokenize
 
 
 class TestBasicParsing:
@@ -353,3 +357,377 @@ class TestTraceMode:
         decoder = JSONDecoder(trace=False)
         result = decoder.decode('{"test": 123}')
         assert result == {"test": 123}
+
+
+class TestRawDecode:
+    """Testy raw_decode (wiele wartości w jednym buforze)"""
+
+    def test_returns_value_and_end_index(self):
+        decoder = JSONDecoder()
+        assert decoder.raw_decode('{"a": 1} tail') == ({"a": 1}, 8)
+
+    def test_walks_concatenated_values(self):
+        decoder = JSONDecoder()
+        buf = '{"a": 1}[2, 3] "x" 42 true'
+        idx = 0
+        values = []
+        while idx < len(buf):
+            value, idx = decoder.raw_decode(buf, idx)
+            values.append(value)
+            while idx < len(buf) and buf[idx] == " ":
+                idx += 1
+        assert values == [{"a": 1}, [2, 3], "x", 42, True]
+
+    def test_does_not_tokenize_past_value(self):
+        decoder = JSONDecoder()
+        # Niezamknięty string po wartości nie może przerwać dekodowania
+        assert decoder.raw_decode('[1] "unterminated') == ([1], 3)
+
+    def test_skips_leading_whitespace(self):
+        decoder = JSONDecoder()
+        assert decoder.raw_decode('xx  "s"', 2) == ("s", 7)
+
+    def test_error_position_is_absolute(self):
+        decoder = JSONDecoder()
+        with pytest.raises(TokenizeError) as exc_info:
+            decoder.raw_decode('{"a": 1}\n[1,, 2]', 8)
+        assert exc_info.value.line == 2
+        assert exc_info.value.column == 4
+
+    def test_index_past_end(self):
+        decoder = JSONDecoder()
+        with pytest.raises(ValueError):
+            decoder.raw_decode("[]", 2)
+
+
+class TestIncludeProjection:
+    """Testy dekodowania wybranych pól (include)"""
+
+    DOC = (
+        '{"users": [{"id": 1, "name": "A", "bio": "x]}", "tags": ["t", {"d": [1]}]},'
+        ' {"id": 2, "name": "B", "extra": null}], "total": 2, "meta": {"v": 1}}'
+    )
+
+    def test_nested_projection(self):
+        decoder = JSONDecoder(include={"users": {"id", "name"}})
+        assert decoder.decode(self.DOC) == {
+            "users": [{"id": 1, "name": "A"}, {"id": 2, "name": "B"}]
+        }
+
+    def test_full_subtree_with_true_or_none(self):
+        decoder = JSONDecoder(include={"meta": True, "total": None})
+        assert decoder.decode(self.DOC) == {"meta": {"v": 1}, "total": 2}
+
+    def test_list_of_top_level_keys(self):
+        decoder = JSONDecoder(include=["total"])
+        assert decoder.decode(self.DOC) == {"total": 2}
+
+    def test_missing_keys_are_absent(self):
+        decoder = JSONDecoder(include={"nope": True, "users": {"missing"}})
+        assert decoder.decode(self.DOC) == {"users": [{}, {}]}
+
+    def test_scalar_root_is_returned(self):
+        decoder = JSONDecoder(include={"a"})
+        assert decoder.decode("[1, 2]") == [1, 2]
+
+    def test_skipped_values_keep_positions_for_errors(self):
+        decoder = JSONDecoder(include={"b"})
+        with pytest.raises(TokenizeError) as exc_info:
+            decoder.decode('{"a": [1, 2],\n "b": [1,, 2]}')
+        assert exc_info.value.line == 2
+        assert exc_info.value.column == 10
+
+    def test_unterminated_skipped_value_raises(self):
+        decoder = JSONDecoder(include={"b"})
+        with pytest.raises(TokenizeError):
+            decoder.decode('{"a": [1, "open}')
+
+    def test_extra_data_still_detected(self):
+        decoder = JSONDecoder(include={"b"})
+        with pytest.raises(TokenizeError, match="Extra data"):
+            decoder.decode('{"a": {"x": 1}} 5')
+
+    def test_raw_decode_end_after_skipped_value(self):
+        decoder = JSONDecoder(include={"b"})
+        assert decoder.raw_decode('{"a": {"x": 1}}[]') == ({}, 15)
+
+
+class TestRawSubtrees:
+    """Testy zachowywania poddrzew jako RawJSON"""
+
+    DOC = (
+        '{"id": 7, "payload": {"a": [1,  2], "s": "x\\"}"}, '
+        '"items": [{"body": [true]}, {"body": 3}]}'
+    )
+
+    def test_selected_values_are_raw_slices(self):
+        result = JSONDecoder(raw={"payload"}).decode(self.DOC)
+        assert type(result["payload"]) is RawJSON
+        assert result["payload"] == '{"a": [1,  2], "s": "x\\"}"}'
+        assert result["id"] == 7
+        assert result["items"] == [{"body": [True]}, {"body": 3}]
+
+    def test_nested_spec_descends_through_arrays(self):
+        result = JSONDecoder(raw={"items": {"body"}}).decode(self.DOC)
+        assert result["items"] == [{"body": "[true]"}, {"body": "3"}]
+        assert all(type(item["body"]) is RawJSON for item in result["items"])
+
+    def test_round_trip_through_encoder(self):
+        result = JSONDecoder(raw={"payload"}).decode(self.DOC)
+        assert JSONEncoder().encode(result["payload"]) == result["payload"]
+        assert JSONEncoder().encode({"p": result["payload"]}) == (
+            '{"p": {"a": [1,  2], "s": "x\\"}"}}'
+        )
+
+    def test_parse_tokens_without_source_reencodes(self):
+        result = JSONDecoder(raw={"payload"}).parse_tokens(list(tokenize(self.DOC)))
+        assert result["payload"] == '{"a": [1, 2], "s": "x\\"}"}'
+
+    def test_missing_value_raises(self):
+        with pytest.raises(TokenizeError, match="Unexpected token"):
+            JSONDecoder(raw={"a"}).decode('{"a": }')
+
+    def test_skimmed_values_are_not_validated(self):
+        assert JSONDecoder(raw={"a"}).decode('{"a": [1,,2]}') == {"a": "[1,,2]"}
+
+    def test_check_raw_validates_selected_values(self):
+        with pytest.raises(TokenizeError) as exc_info:
+            JSONDecoder(raw={"a"}, check_raw=True).decode('{"a": [1,,2]}')
+        assert exc_info.value.offset == 9
+        result = JSONDecoder(raw={"payload"}, check_raw=True).decode(self.DOC)
+        assert type(result["payload"]) is RawJSON
+        assert result["payload"] == '{"a": [1,  2], "s": "x\\"}"}'
+        assert result["items"] == [{"body": [True]}, {"body": 3}]
+
+    def test_check_raw_applies_limits_and_numeric_arrays(self):
+        with pytest.raises(LimitError):
+            JSONDecoder(raw={"a"}, check_raw=True, max_depth=2).decode('{"a": [[1]]}')
+        decoder = JSONDecoder(raw={"a"}, check_raw=True, numeric_arrays="array")
+        assert decoder.decode('{"a": [1, 2], "b": 0}') == {"a": "[1, 2]", "b": 0}
+
+    def test_raw_and_include_are_exclusive(self):
+        with pytest.raises(ValueError):
+            JSONDecoder(include={"a"}, raw={"b"})
+
+
+class TestNonFiniteLiterals:
+    """Testy opcjonalnego dekodowania NaN i Infinity"""
+
+    def test_literals_rejected_by_default(self):
+        for doc in ("NaN", "[Infinity]", '{"a": -Infinity}'):
+            with pytest.raises(TokenizeError):
+                JSONDecoder().decode(doc)
+
+    def test_literals_accepted_with_allow_nan(self):
+        result = JSONDecoder(allow_nan=True).decode("[NaN, Infinity, -Infinity, -1]")
+        assert result[0] != result[0]
+        assert result[1:] == [float("inf"), float("-inf"), -1]
+
+    def test_round_trip_with_encoder(self):
+        text = JSONEncoder(allow_nan="literal").encode({"x": float("-inf")})
+        assert JSONDecoder(allow_nan=True).decode(text) == {"x": float("-inf")}
+
+
+class TestNumericArrays:
+    """Testy dekodowania tablic liczbowych do array"""
+
+    def test_integer_arrays_become_q(self):
+        result = JSONDecoder(numeric_arrays="array").decode('{"a": [1, -2 , 3]}')
+        assert result["a"] == array("q", [1, -2, 3])
+
+    def test_float_arrays_become_d(self):
+        result = JSONDecoder(numeric_arrays="array").decode("[[1.5, 2e3], [0, -0.25]]")
+        assert result == [array("d", [1.5, 2000.0]), array("d", [0.0, -0.25])]
+
+    def test_mixed_empty_and_huge_arrays_stay_lists(self):
+        decoder = JSONDecoder(numeric_arrays="array")
+        assert decoder.decode('[[1, "x"], [], [99999999999999999999]]') == [
+            [1, "x"],
+            [],
+            [99999999999999999999],
+        ]
+
+    def test_large_ints_next_to_floats_keep_precision(self):
+        decoder = JSONDecoder(numeric_arrays="array")
+        assert decoder.decode("[9007199254740993, 0.5]") == [9007199254740993, 0.5]
+        assert decoder.decode("[-9007199254740992, 0.5]") == array("d", [-(2.0**53), 0.5])
+
+    def test_parsing_continues_after_array(self):
+        decoder = JSONDecoder(numeric_arrays="array")
+        assert decoder.decode('{"a": [1, 2], "b": true}') == {
+            "a": array("q", [1, 2]),
+            "b": True,
+        }
+        assert decoder.raw_decode("[1,2] [3]") == (array("q", [1, 2]), 5)
+
+    def test_errors_keep_positions(self):
+        decoder = JSONDecoder(numeric_arrays="array")
+        with pytest.raises(TokenizeError, match="Invalid number"):
+            decoder.decode("[1, 01]")
+        with pytest.raises(TokenizeError, match="Extra data"):
+            decoder.decode("[1, 2] 3")
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            JSONDecoder(numeric_arrays="list")
+
+    def test_numpy_mode(self):
+        numpy = pytest.importorskip("numpy")
+        result = JSONDecoder(numeric_arrays="numpy").decode("[[1, 2], [0.5]]")
+        assert isinstance(result[0], numpy.ndarray)
+        assert result[0].dtype == numpy.int64
+        assert result[1].tolist() == [0.5]
+
+
+class TestResourceLimits:
+    """Testy limitów zasobów dla niezaufanego wejścia"""
+
+    def _limit_error(self, doc, **limits):
+        with pytest.raises(LimitError) as exc_info:
+            JSONDecoder(**limits).decode(doc)
+        return exc_info.value
+
+    def test_within_limits(self):
+        limits = {
+            "max_bytes": 100,
+            "max_depth": 2,
+            "max_string_length": 3,
+            "max_container_items": 2,
+            "max_total_values": 7,
+        }
+        doc = '{"a": [1, "abc"], "b": {"c": null}}'
+        assert JSONDecoder(**limits).decode(doc) == {"a": [1, "abc"], "b": {"c": None}}
+
+    def test_max_bytes_counts_utf8(self):
+        assert JSONDecoder(max_bytes=6).decode('"żż"') == "żż"
+        err = self._limit_error('["żż"]', max_bytes=7)
+        assert isinstance(err, TokenizeError)
+        assert err.offset == 7
+
+    def test_max_bytes_applies_to_raw_decode(self):
+        decoder = JSONDecoder(max_bytes=6)
+        assert decoder.raw_decode("xxxxxx[1, 2]", 6) == ([1, 2], 12)
+        with pytest.raises(LimitError) as exc_info:
+            decoder.raw_decode("xx[1, 2, 3]", 2)
+        assert exc_info.value.offset == 8
+
+    def test_max_depth_is_capped_by_recursion_limit(self):
+        with pytest.raises(ValueError, match="max_depth"):
+            JSONDecoder(max_depth=100_000)
+        assert JSONDecoder(max_depth=400).decode("[" * 400 + "]" * 400)
+
+    def test_max_depth(self):
+        err = self._limit_error('{"a": [[1]]}', max_depth=2)
+        assert (err.line, err.column, err.offset) == (1, 8, 7)
+
+    def test_max_string_length(self):
+        assert self._limit_error('["abcdef"]', max_string_length=5).offset == 1
+        assert self._limit_error('{"key_too_long": 1}', max_string_length=5).offset == 1
+        assert self._limit_error('["ab\\ncdef"]', max_string_length=5).offset == 1
+        assert JSONDecoder(max_string_length=5).decode('["ab\\ncd"]') == ["ab\ncd"]
+
+    def test_max_container_items(self):
+        assert self._limit_error("[1, 2, 3]", max_container_items=2).offset == 5
+        assert self._limit_error('{"a": 1, "b": 2, "c": 3}', max_container_items=2).offset == 15
+
+    def test_max_total_values_ignores_keys(self):
+        doc = '{"a": {"b": 1}, "c": []}'
+        assert JSONDecoder(max_total_values=4).decode(doc) == {"a": {"b": 1}, "c": []}
+        self._limit_error(doc, max_total_values=3)
+
+    def test_numeric_arrays_are_counted(self):
+        limits = {"numeric_arrays": "array", "max_total_values": 6}
+        assert self._limit_error("[1, 2, [3, 4, 5]]", **limits).offset == 7
+        limits = {"numeric_arrays": "array", "max_container_items": 2}
+        assert self._limit_error("[1, [3, 4, 5]]", **limits).offset == 4
+
+    def test_skipped_subtrees_are_not_counted(self):
+        decoder = JSONDecoder(include={"b"}, max_depth=2, max_container_items=3)
+        assert decoder.decode('{"skip": [[[1, 2, 3, 4]]], "b": [1]}') == {"b": [1]}
+        decoder = JSONDecoder(raw={"skip"}, max_depth=2)
+        assert decoder.decode('{"skip": [[[1]]], "b": [1]}')["b"] == [1]
+
+
+class TestDuplicateKeys:
+    """Testy polityki zduplikowanych kluczy"""
+
+    DOC = '{"a": 1, "b": [2], "a": 3, "a": [4]}'
+
+    def test_last_wins_by_default(self):
+        assert JSONDecoder().decode(self.DOC) == {"a": [4], "b": [2]}
+        assert JSONDecoder(duplicate_keys="last").decode(self.DOC) == {"a": [4], "b": [2]}
+
+    def test_first_wins(self):
+        assert JSONDecoder(duplicate_keys="first").decode(self.DOC) == {"a": 1, "b": [2]}
+
+    def test_error(self):
+        with pytest.raises(TokenizeError) as exc_info:
+            JSONDecoder(duplicate_keys="error").decode(self.DOC)
+        assert "Duplicate key 'a'" in str(exc_info.value)
+        assert exc_info.value.offset == 19
+
+    def test_error_in_nested_object(self):
+        with pytest.raises(TokenizeError):
+            JSONDecoder(duplicate_keys="error").decode('[{"x": 1}, {"y": 1, "y": 2}]')
+        assert JSONDecoder(duplicate_keys="error").decode('[{"x": 1}, {"x": 2}]') == [
+            {"x": 1},
+            {"x": 2},
+        ]
+
+    def test_collect(self):
+        result = JSONDecoder(duplicate_keys="collect").decode(self.DOC)
+        assert result == {"a": [1, 3, [4]], "b": [2]}
+
+    def test_collect_keeps_list_values_intact(self):
+        result = JSONDecoder(duplicate_keys="collect").decode('{"a": [1], "a": [2], "a": [3]}')
+        assert result == {"a": [[1], [2], [3]]}
+
+    def test_policy_applies_with_include_raw_and_validate(self):
+        doc = '{"a": {"b": 1, "b": 2}, "a": 0}'
+        assert JSONDecoder(include={"a": {"b"}}, duplicate_keys="first").decode(doc) == {
+            "a": {"b": 1}
+        }
+        assert JSONDecoder(raw={"c"}, duplicate_keys="collect").decode(doc) == {
+            "a": [{"b": [1, 2]}, 0]
+        }
+        with pytest.raises(TokenizeError):
+            JSONDecoder(validate={"type": "object"}, duplicate_keys="error").decode(doc)
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            JSONDecoder(duplicate_keys="merge")
+
+
+class TestReusableDecoder:
+    """Testy wielokrotnego i współbieżnego użycia jednego dekodera"""
+
+    def test_reuse_after_error(self):
+        decoder = JSONDecoder()
+        with pytest.raises(TokenizeError):
+            decoder.decode('{"a": }')
+        assert decoder.decode('{"a": 1}') == {"a": 1}
+        assert decoder.raw_decode("[1, 2] [3]") == ([1, 2], 6)
+
+    def test_nested_use_from_another_decode(self):
+        decoder = JSONDecoder()
+        tokens = iter(tokenize('{"inner": "[1, [2]]"}'))
+
+        def inner_tokens():
+            for tok in tokens:
+                if tok.type == "STRING" and tok.value.startswith("["):
+                    assert decoder.decode(tok.value) == [1, [2]]
+                yield tok
+
+        assert decoder.parse_tokens(inner_tokens()) == {"inner": "[1, [2]]"}
+
+    def test_shared_between_threads(self):
+        decoder = JSONDecoder(max_depth=8, duplicate_keys="collect")
+        docs = [f'{{"n": {i}, "n": [{i}], "items": {list(range(i))}}}' for i in range(50)]
+
+        def decode_all():
+            return [decoder.decode(doc) for doc in docs]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: decode_all(), range(8)))
+        expected = [{"n": [i, [i]], "items": list(range(i))} for i in range(50)]
+        assert all(result == expected for result in results)
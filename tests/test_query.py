@@ -0,0 +1,109 @@
+import pytest
+
+from json_engine.api import dumps
+from json_engine.query import JSONPath, compile_path
+from json_engine.tokenizer import TokenizeError, tokenize
+
+DOC = {
+    "users": [
+        {"id": 1, "name": "Alice", "age": 30, "meta": {"group": 1, "admin": True}},
+        {"id": 2, "name": "Bob", "age": 17, "meta": {"group": 2, "admin": False}},
+        {"id": 3, "name": "Carol", "age": 45, "meta": {"group": 1}},
+    ],
+    "count": 3,
+    "tags": ["a", "b", "c", "d"],
+}
+TEXT = dumps(DOC)
+
+
+def _both(expr):
+    path = compile_path(expr)
+    from_data = path.find(DOC)
+    from_stream = path.search(TEXT)
+    assert from_data == from_stream
+    return from_data
+
+
+class TestCompile:
+    """Testy kompilacji wyrażeń ścieżek"""
+
+    def test_compile_returns_reusable_object(self):
+        path = compile_path("$.count")
+        assert isinstance(path, JSONPath)
+        assert path.find(DOC) == [3]
+        assert path.find({"count": 7}) == [7]
+
+    @pytest.mark.parametrize("expr", ["users", "$.", "$[", "$[?(@.a ~ 1)]", "$.a[1:2:0]"])
+    def test_invalid_expressions(self, expr):
+        with pytest.raises(ValueError):
+            compile_path(expr)
+
+
+class TestQueryMatching:
+    """Testy dopasowań na danych i na strumieniu tokenów"""
+
+    def test_root(self):
+        assert _both("$") == [DOC]
+
+    def test_nested_keys_with_wildcard(self):
+        assert _both("$.users[*].meta.group") == [1, 2, 1]
+
+    def test_bracket_keys(self):
+        assert _both("$['users'][0][\"name\"]") == ["Alice"]
+
+    def test_dot_wildcard_on_object(self):
+        assert _both("$.users[0].meta.*") == [1, True]
+
+    def test_index_and_negative_index(self):
+        assert _both("$.tags[1]") == ["b"]
+        assert _both("$.tags[-1]") == ["d"]
+        assert _both("$.tags[9]") == []
+
+    def test_slices(self):
+        assert _both("$.tags[1:3]") == ["b", "c"]
+        assert _both("$.tags[::2]") == ["a", "c"]
+        assert _both("$.tags[-2:]") == ["c", "d"]
+        assert _both("$.users[:2].id") == [1, 2]
+
+    def test_filters(self):
+        assert _both("$.users[?(@.age >= 18)].name") == ["Alice", "Carol"]
+        assert _both("$.users[?(@.meta.group == 1)].id") == [1, 3]
+        assert _both("$.users[?(@.name == 'Bob')].id") == [2]
+        assert _both("$.users[?(@.meta.admin)].id") == [1, 2]
+        assert _both("$.users[?(@.meta.admin == true)].id") == [1]
+
+    def test_filter_does_not_confuse_bool_and_int(self):
+        assert compile_path("$[?(@.v == 1)]").find([{"v": True}, {"v": 1}]) == [{"v": 1}]
+
+    def test_missing_path(self):
+        assert _both("$.nothing.here") == []
+        assert _both("$.count.deeper") == []
+
+    def test_containers_are_materialized(self):
+        assert _both("$.users[1].meta") == [{"group": 2, "admin": False}]
+
+
+class TestStreamMatching:
+    """Testy dopasowania bezpośrednio na tokenach"""
+
+    def test_accepts_token_iterator(self):
+        tokens = tokenize('{"a": {"b": [10, 20]}}')
+        assert compile_path("$.a.b[1]").find_tokens(tokens) == [20]
+
+    def test_skipped_subtrees_are_not_validated_deeply(self):
+        # Pomijane poddrzewa tylko bilansują nawiasy
+        assert compile_path("$.b").search('{"a": [1 2 3], "b": 5}') == [5]
+
+    def test_malformed_structure_raises(self):
+        with pytest.raises(TokenizeError):
+            compile_path("$.a").search('{"a" 1}')
+
+    def test_truncated_input_raises(self):
+        with pytest.raises(TokenizeError):
+            compile_path("$.b").search('{"a": [1, 2')
+
+    def test_trailing_data_raises(self):
+        with pytest.raises(TokenizeError, match="Extra data"):
+            compile_path("$.a").search('{"a": 1} {"a": 2}')
+        with pytest.raises(TokenizeError, match="Extra data"):
+            compile_path("$.a").find_tokens(tokenize('{"a": 1} 2'))
@@ -0,0 +1,156 @@
+import sys
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import pytest
+
+from json_engine.encoder import JSONEncoder
+from json_engine.schema import SchemaDecoder, SchemaEncoder, compile_decoder, compile_encoder
+from json_engine.tokenizer import TokenizeError
+
+
+@dataclass
+class Geo:
+    lat: float
+    lon: float
+
+
+@dataclass
+class Event:
+    id: int
+    kind: str
+    ok: bool
+    score: Optional[float]
+    tags: List[str]
+    geo: Geo
+    path: List[Geo] = field(default_factory=list)
+
+
+EVENT = (
+    '{"id": 5, "kind": "cl\\"ick", "ok": true, "score": null, "tags": ["a", "b, c"],'
+    ' "geo": {"lat": 1.5, "lon": 2}, "path": [{"lat": 0, "lon": -1e2}]}'
+)
+
+
+class TestSchemaDecoder:
+    """Testy dekoderów kompilowanych ze schematu"""
+
+    def test_dataclass_fast_path(self):
+        decoder = compile_decoder(Event)
+        assert isinstance(decoder, SchemaDecoder)
+        event = decoder.decode(EVENT)
+        assert event == Event(
+            5, 'cl"ick', True, None, ["a", "b, c"], Geo(1.5, 2.0), [Geo(0.0, -100.0)]
+        )
+        assert decoder.fallbacks == 0
+
+    def test_dict_schema(self):
+        decoder = compile_decoder({"a": int, "b": [{"c": str}], "d": None, "e": [float]})
+        result = decoder.decode('{ "a" : 1 ,"b": [{"c": "x"}, {"c": ""}], "d": null, "e": []}')
+        assert result == {"a": 1, "b": [{"c": "x"}, {"c": ""}], "d": None, "e": []}
+        assert decoder.fallbacks == 0
+
+    def test_reordered_keys_fall_back(self):
+        decoder = compile_decoder(Geo)
+        assert decoder.decode('{"lon": 2.0, "lat": 1.0}') == Geo(1.0, 2.0)
+        assert decoder.fallbacks == 1
+
+    def test_fallback_keeps_extra_keys_of_dict_schema(self):
+        decoder = compile_decoder({"a": int})
+        assert decoder.decode('{"a": 1, "extra": [1]}') == {"a": 1, "extra": [1]}
+        assert decoder.fallbacks == 1
+
+    def test_fallback_validates_types(self):
+        with pytest.raises(ValueError, match="Expected integer, got str"):
+            compile_decoder({"a": int}).decode('{"a": "x", "extra": [1]}')
+        with pytest.raises(ValueError, match="Expected number"):
+            compile_decoder(Geo).decode('{"lon": 1, "lat": "nope"}')
+        with pytest.raises(ValueError, match="Expected array"):
+            compile_decoder({"a": [int]}).decode('{"b": 0, "a": {}}')
+
+    def test_fallback_widens_ints_like_fast_path(self):
+        decoder = compile_decoder({"x": float, "y": int})
+        assert decoder.decode('{"x": 5, "y": 1}') == {"x": 5.0, "y": 1}
+        fallback = decoder.decode('{"y": 1, "x": 5}')
+        assert fallback == {"x": 5.0, "y": 1}
+        assert type(fallback["x"]) is float
+
+    def test_init_false_fields_are_not_decoded(self):
+        @dataclass
+        class Tagged:
+            name: str
+            size: int = field(init=False, default=0)
+
+        decoder = compile_decoder(Tagged)
+        assert decoder.decode('{"name": "x"}') == Tagged("x")
+        assert decoder.decode('{"name": "x", "size": 3}') == Tagged("x")
+        assert decoder.fallbacks == 1
+
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="kw_only needs Python 3.10")
+    def test_kw_only_dataclass(self):
+        @dataclass(kw_only=True)
+        class Point:
+            x: int
+            y: int
+
+        decoder = compile_decoder(Point)
+        assert decoder.decode('{"x": 1, "y": 2}') == Point(x=1, y=2)
+        assert decoder.fallbacks == 0
+
+    def test_missing_dataclass_fields(self):
+        with pytest.raises(ValueError, match="Geo"):
+            compile_decoder(Geo).decode('{"lat": 1.0}')
+
+    def test_missing_dict_schema_keys(self):
+        with pytest.raises(ValueError, match="Missing key 'b'"):
+            compile_decoder({"a": int, "b": [int]}).decode('{"a": 1}')
+
+    def test_syntax_errors_come_from_generic_decoder(self):
+        with pytest.raises(TokenizeError):
+            compile_decoder({"a": int}).decode('{"a": 1,}')
+        with pytest.raises(ValueError):
+            compile_decoder({"a": int}).decode("")
+
+    def test_unsupported_schema(self):
+        with pytest.raises(TypeError):
+            compile_decoder({"a": dict})
+
+
+class TestSchemaEncoder:
+    """Testy enkoderów kompilowanych ze schematu"""
+
+    EVENT = Event(5, 'cl"ick', True, None, ["a"], Geo(1.5, 2.0), [Geo(0.0, -1.0)])
+
+    def test_matches_generic_encoder(self):
+        encoder = compile_encoder(Event)
+        assert isinstance(encoder, SchemaEncoder)
+        assert encoder.encode(self.EVENT) == JSONEncoder().encode(self.EVENT)
+
+    def test_options_are_applied(self):
+        encoder = compile_encoder(Geo, separators=(",", ":"), sort_keys=True)
+        assert encoder.encode(Geo(1.0, 2.0)) == '{"lat":1.0,"lon":2.0}'
+        assert compile_encoder({"ł": str}, ensure_ascii=True).encode({"ł": "ó"}) == (
+            '{"\\u0142": "\\u00f3"}'
+        )
+
+    def test_list_of_dict_schema(self):
+        encoder = compile_encoder([{"a": int, "b": Optional[str]}])
+        data = [{"a": 1, "b": None}, {"a": 2, "b": "x"}]
+        assert encoder.encode(data) == '[{"a": 1, "b": null}, {"a": 2, "b": "x"}]'
+        assert encoder.encode_bytes(data) == encoder.encode(data).encode("utf-8")
+
+    def test_mismatched_values_use_generic_encoder(self):
+        encoder = compile_encoder({"a": int, "b": float, "c": [int]})
+        assert encoder.encode({"a": True, "b": 2, "c": [1.5]}) == (
+            '{"a": true, "b": 2, "c": [1.5]}'
+        )
+        assert encoder.encode({"a": 1, "b": 1.0, "c": [], "extra": 0}) == (
+            '{"a": 1, "b": 1.0, "c": [], "extra": 0}'
+        )
+        assert encoder.encode({"a": 1}) == '{"a": 1}'
+
+    def test_non_finite_floats_follow_policy(self):
+        with pytest.raises(ValueError):
+            compile_encoder({"x": float}).encode({"x": float("nan")})
+        encoder = compile_encoder({"x": float}, allow_nan="null")
+        assert encoder.encode({"x": float("inf")}) == '{"x": null}'
@@ -0,0 +1,91 @@
+import io
+import time
+
+import pytest
+
+from json_engine.stream import iter_values
+from json_engine.tokenizer import TokenizeError
+
+
+def _best_time(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+class TestIterValues:
+    """Testy strumienia sklejonych wartości JSON"""
+
+    def test_back_to_back_values(self):
+        fp = io.StringIO('{"a": 1}{"b": 2}[3]"s"')
+        assert list(iter_values(fp)) == [{"a": 1}, {"b": 2}, [3], "s"]
+
+    def test_whitespace_separated_scalars(self):
+        fp = io.StringIO("1 2.5\n-3 true null")
+        assert list(iter_values(fp)) == [1, 2.5, -3, True, None]
+
+    @pytest.mark.parametrize("block_size", [1, 2, 3, 5, 16])
+    def test_values_split_across_blocks(self, block_size):
+        text = '{"name": "Alice \\u0041", "n": 12345}[true, false, null] 678 "end"'
+        values = list(iter_values(io.StringIO(text), block_size=block_size))
+        assert values == [{"name": "Alice A", "n": 12345}, [True, False, None], 678, "end"]
+
+    def test_long_string_spanning_many_blocks(self):
+        text = '"' + "x" * 5000 + '" 1'
+        assert list(iter_values(io.StringIO(text), block_size=8)) == ["x" * 5000, 1]
+
+    @pytest.mark.parametrize("block_size", [1, 2, 3, 4])
+    def test_number_fraction_and_exponent_split_across_blocks(self, block_size):
+        fp = io.StringIO("1.5 2 -3e2 4.25E-1")
+        assert list(iter_values(fp, block_size=block_size)) == [1.5, 2, -300.0, 0.425]
+
+    def test_number_cut_at_default_block_boundary(self):
+        values = list(iter_values(io.StringIO("0 " * 32767 + "1.5")))
+        assert len(values) == 32768
+        assert values[-1] == 1.5
+
+    def test_empty_stream(self):
+        assert list(iter_values(io.StringIO("  \n "))) == []
+
+    def test_invalid_value_raises(self):
+        fp = io.StringIO('{"a": 1} [1,, 2] {"b": 2}')
+        values = iter_values(fp, block_size=4)
+        assert next(values) == {"a": 1}
+        with pytest.raises(TokenizeError):
+            next(values)
+
+    @pytest.mark.parametrize("block_size", [1, 7, 65536])
+    def test_error_position_is_relative_to_stream(self, block_size):
+        fp = io.StringIO("[1]" * 100 + "\n\n[1,,2]")
+        with pytest.raises(TokenizeError) as exc_info:
+            list(iter_values(fp, block_size=block_size))
+        assert (exc_info.value.line, exc_info.value.column, exc_info.value.offset) == (3, 4, 305)
+
+    def test_truncated_stream_raises(self):
+        with pytest.raises(TokenizeError):
+            list(iter_values(io.StringIO('{"a": 1} {"b": ')))
+
+    def test_consumes_lazily(self):
+        class CountingIO(io.StringIO):
+            reads = 0
+
+            def read(self, size=-1):
+                CountingIO.reads += 1
+                return super().read(size)
+
+        fp = CountingIO("[0]" * 10000)
+        values = iter_values(fp, block_size=32)
+        assert next(values) == [0]
+        assert CountingIO.reads == 1
+
+    def test_time_is_linear_in_block_size(self):
+        # Decoding a value must not rescan the buffer in front of it.
+        def run(count):
+            text = "[1]\n" * count
+            return lambda: sum(1 for _ in iter_values(io.StringIO(text), block_size=len(text)))
+
+        small, large = _best_time(run(5000)), _best_time(run(40000))
+        assert large < small * 24
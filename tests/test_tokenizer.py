@@ -1,6 +1,8 @@
+import pickle
+
 import pytest
 
-from json_engine.tokenizer import TokenizeError, tokenize
+from json_engine.tokenizer import LimitError, TokenizeError, skip_value, tokenize
 
 
 class TestTokenizerBasics:
@@ -165,6 +167,26 @@ class TestLineAndColumnTracking:
             assert e.line == 2
             assert "@@" in str(e) or "Unexpected" in str(e)
 
+    def test_token_offsets(self):
+        tokens = list(tokenize('{"a\\n": 12, "b": true}'))
+        assert [(t.offset, t.end) for t in tokens] == [
+            (0, 1),
+            (1, 6),
+            (6, 7),
+            (8, 10),
+            (10, 11),
+            (12, 15),
+            (15, 16),
+            (17, 21),
+            (21, 22),
+        ]
+
+    def test_start_offset_keeps_absolute_positions(self):
+        json_str = '[1,\n 2,\n "x"]'
+        tokens = list(tokenize(json_str, start=8))
+        assert tokens[0].value == "x"
+        assert (tokens[0].line, tokens[0].column, tokens[0].offset) == (3, 2, 9)
+
 
 class TestComplexStructures:
     """Testy złożonych struktur JSON"""
@@ -233,3 +255,82 @@ class TestEdgeCases:
     def test_tabs_and_spaces(self):
         tokens = list(tokenize('{\t"key":\t\t"value"\t}'))
         assert len(tokens) == 5  # {, "key", :, "value", }
+
+
+class TestSkipValue:
+    """Testy pomijania wartości bez dekodowania"""
+
+    def test_skips_containers_with_brackets_in_strings(self):
+        s = '{"a": [1, {"b": "x]}\\""}], "c": 2}'
+        assert skip_value(s, 0) == len(s)
+        assert s[6 : skip_value(s, 5)] == '[1, {"b": "x]}\\""}]'
+
+    def test_skips_scalars(self):
+        assert skip_value(" 123 ,", 0) == 4
+        assert skip_value('"a\\"b" x', 0) == 6
+        assert skip_value("true]", 0) == 4
+
+    def test_unterminated_values(self):
+        with pytest.raises(TokenizeError, match="Unterminated string"):
+            skip_value('[1, "abc', 0)
+        with pytest.raises(TokenizeError):
+            skip_value("[1, [2]", 0)
+
+    def test_tokenizer_resumes_at_sent_offset(self):
+        s = '{"a": [1,\n 2], "b": 3}'
+        tokens = tokenize(s)
+        assert [next(tokens).type for _ in range(3)] == ["{", "STRING", ":"]
+        tok = tokens.send(skip_value(s, 5))
+        assert tok.type == ","
+        assert (tok.line, tok.column, tok.offset) == (2, 4, 13)
+        assert [t.value for t in tokens] == ["b", ":", "3", "}"]
+
+
+class TestNonFiniteTokens:
+    """Testy tokenów NaN i Infinity"""
+
+    def test_allow_nan_emits_number_tokens(self):
+        tokens = list(tokenize("[NaN, -Infinity]", allow_nan=True))
+        assert [(t.type, t.value) for t in tokens[1:4:2]] == [
+            ("NUMBER", "NaN"),
+            ("NUMBER", "-Infinity"),
+        ]
+        assert tokens[3].end == 15
+
+    def test_without_allow_nan_is_error(self):
+        with pytest.raises(TokenizeError):
+            list(tokenize("Infinity"))
+
+
+class TestTokenizeErrorPickling:
+    """Testy serializacji wyjątków (np. z procesów roboczych)"""
+
+    def test_round_trip_keeps_type_and_fields(self):
+        for exc in (TokenizeError("Bad", 2, 3, 10), LimitError("Too deep", 1, 5, 4)):
+            restored = pickle.loads(pickle.dumps(exc))
+            assert type(restored) is type(exc)
+            assert str(restored) == str(exc)
+            assert (restored.msg, restored.line, restored.column, restored.offset) == (
+                exc.msg,
+                exc.line,
+                exc.column,
+                exc.offset,
+            )
+
+
+class TestStringFastPath:
+    """Testy szybkiej ścieżki dla stringów bez escape'ów"""
+
+    def test_plain_and_escaped_strings_agree(self):
+        tokens = list(tokenize('["plain", "esc\\"aped", ""]'))
+        assert [t.value for t in tokens if t.type == "STRING"] == ["plain", 'esc"aped', ""]
+        assert [(t.offset, t.end, t.column) for t in tokens if t.type == "STRING"] == [
+            (1, 8, 2),
+            (10, 21, 11),
+            (23, 25, 24),
+        ]
+
+    def test_max_string_length(self):
+        with pytest.raises(LimitError):
+            list(tokenize('"abcdef"', max_string_length=5))
+        assert next(tokenize('"abcde"', max_string_length=5)).value == "abcde"
@@ -0,0 +1,89 @@
+import pytest
+
+from json_engine.api import loads
+from json_engine.parser import JSONDecoder
+from json_engine.tokenizer import TokenizeError
+from json_engine.validate import CompiledSchema, ValidationError, compile_schema
+
+SCHEMA = {
+    "type": "object",
+    "required": ["id", "tags"],
+    "properties": {
+        "id": {"type": "integer", "minimum": 1, "maximum": 100},
+        "tags": {
+            "type": "array",
+            "maxItems": 2,
+            "items": {"type": "string", "maxLength": 3},
+        },
+        "kind": {"enum": ["x", None]},
+        "flag": {"type": ["boolean", "null"]},
+    },
+}
+
+
+def _error(doc):
+    with pytest.raises(ValidationError) as exc_info:
+        JSONDecoder(validate=SCHEMA).decode(doc)
+    return exc_info.value
+
+
+class TestStreamingValidation:
+    """Testy walidacji schematu podczas parsowania"""
+
+    def test_valid_document(self):
+        doc = '{"id": 2, "tags": ["a", "bb"], "kind": null, "flag": true, "other": [1]}'
+        assert JSONDecoder(validate=SCHEMA).decode(doc) == {
+            "id": 2,
+            "tags": ["a", "bb"],
+            "kind": None,
+            "flag": True,
+            "other": [1],
+        }
+
+    def test_type_mismatch_reports_position_and_path(self):
+        err = _error('{"id": 2,\n "tags": [1]}')
+        assert isinstance(err, TokenizeError)
+        assert (err.line, err.column, err.offset) == (2, 11, 20)
+        assert err.path == "$.tags[0]"
+        assert err.msg.startswith("Expected string")
+
+    def test_integer_and_bounds(self):
+        assert _error('{"id": 1.5, "tags": []}').msg.startswith("Expected integer")
+        assert "minimum" in _error('{"id": 0, "tags": []}').msg
+        assert "maximum" in _error('{"id": 101, "tags": []}').msg
+        assert JSONDecoder(validate=SCHEMA).decode('{"id": 3.0, "tags": []}')["id"] == 3.0
+
+    def test_max_length_max_items_and_enum(self):
+        assert "maxLength" in _error('{"id": 1, "tags": ["abcd"]}').msg
+        err = _error('{"id": 1, "tags": ["a", "b", "c"]}')
+        assert err.offset == 29
+        assert "more than 2 items" in err.msg
+        assert "not one of" in _error('{"id": 1, "tags": [], "kind": "y"}').msg
+        assert "not one of" in _error('{"id": 1, "tags": [], "kind": false}').msg
+
+    def test_missing_required_reported_at_closing_brace(self):
+        err = _error('{"id": 1}')
+        assert err.offset == 8
+        assert "'tags'" in err.msg
+
+    def test_stops_before_parsing_the_rest(self):
+        doc = '{"id": "x", "tags": [' + "1, " * 10000 + "}"
+        assert _error(doc).path == "$.id"
+
+    def test_syntax_errors_are_not_validation_errors(self):
+        with pytest.raises(TokenizeError) as exc_info:
+            JSONDecoder(validate=SCHEMA).decode('{"id": ,}')
+        assert not isinstance(exc_info.value, ValidationError)
+
+    def test_compile_schema(self):
+        compiled = compile_schema({"type": "string"})
+        assert isinstance(compiled, CompiledSchema)
+        assert compile_schema(compiled) is compiled
+        with pytest.raises(ValueError):
+            compile_schema({"type": "decimal"})
+
+    def test_loads_validate(self):
+        with pytest.raises(ValidationError):
+            loads("[1, 2, 3]", validate={"type": "array", "maxItems": 2})
+        with pytest.raises(ValueError):
+            JSONDecoder(include={"a"}, validate={})